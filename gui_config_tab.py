@@ -517,7 +517,8 @@ class GlobalConfigSection:
                     'attach_button': 'Botón Adjuntar',
                     'search_box': 'Campo de Búsqueda',
                     'send_button': 'Botón Enviar',
-                    'file_input': 'Input de Archivo'
+                    'file_input': 'Input de Archivo',
+                    'qr_code': 'Código QR'
                 }
 
                 display_name = display_names.get(key, key.replace('_', ' ').title())
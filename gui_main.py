@@ -8,6 +8,7 @@ intuitiva y organizada, optimizada para pantallas de cualquier tamaño.
 """
 
 import tkinter as tk
+from collections import deque
 from tkinter import messagebox
 from data_manager import DataManager
 from whatsapp_bot import WhatsAppBot
@@ -185,6 +186,9 @@ class WhatsAppBotGUI:
     con soporte para personalización de selectores CSS/XPath
     """
 
+    # Intervalo (ms) con el que se vuelcan a la interfaz los mensajes de estado del bot
+    STATUS_FLUSH_INTERVAL_MS = 100
+
     def __init__(self):
         """
         Inicializa la interfaz gráfica y sus componentes con configuración
@@ -193,6 +197,12 @@ class WhatsAppBotGUI:
         self.root = tk.Tk()
         self.style_manager = StyleManager()
         self.data_manager = DataManager()
+
+        # Cola de mensajes de estado: el bot la llena desde su hilo y la interfaz la vacía
+        # por lotes en el hilo de Tk (deque.append es seguro entre hilos)
+        self._status_queue = deque()
+        # Id del próximo vaciado programado con root.after (se cancela al cerrar)
+        self._status_flush_id = None
         self.whatsapp_bot = WhatsAppBot(status_callback=self._update_status)
 
         # Variables de estado
@@ -201,6 +211,7 @@ class WhatsAppBotGUI:
         # Configurar la aplicación
         self._setup_application()
         self._create_interface()
+        self._schedule_status_flush()
 
     def _setup_application(self):
         """
@@ -320,16 +331,57 @@ class WhatsAppBotGUI:
 
     def _update_status(self, message):
         """
-        Actualiza el estado en la barra lateral y en la pestaña de automatización
+        Encola un mensaje de estado para mostrarlo en el próximo volcado a la interfaz
 
         Args:
             message: Mensaje de estado
         """
-        # Actualizar estado en sidebar
-        self.sidebar.update_status(message)
+        self._status_queue.append(message)
+
+    def _schedule_status_flush(self):
+        """
+        Programa el próximo vaciado de la cola de estado si la ventana sigue abierta
+        """
+        try:
+            if self.root.winfo_exists():
+                self._status_flush_id = self.root.after(self.STATUS_FLUSH_INTERVAL_MS,
+                                                        self._flush_status_queue)
+                return
+        except tk.TclError:
+            pass  # La aplicación ya fue destruida
+        self._status_flush_id = None
+
+    def _cancel_status_flush(self):
+        """
+        Cancela el vaciado programado de la cola de estado
+        """
+        if self._status_flush_id is not None:
+            try:
+                self.root.after_cancel(self._status_flush_id)
+            except tk.TclError:
+                pass
+            self._status_flush_id = None
 
-        # Actualizar log en pestaña de automatización
-        self.tab_manager.update_automation_status(message)
+    def _flush_status_queue(self):
+        """
+        Vuelca los mensajes de estado pendientes en la barra lateral y en la pestaña de automatización
+        """
+        try:
+            messages = []
+            while self._status_queue:
+                messages.append(self._status_queue.popleft())
+
+            if messages:
+                # La barra lateral solo muestra el último estado
+                self.sidebar.update_status(messages[-1])
+
+                # El log de la pestaña de automatización registra todos los mensajes
+                for message in messages:
+                    self.tab_manager.update_automation_status(message)
+        except Exception as e:
+            print(f"Error actualizando estado: {e}")
+        finally:
+            self._schedule_status_flush()
 
     def _update_global_stats(self):
         """
@@ -386,7 +438,8 @@ class WhatsAppBotGUI:
         except Exception as e:
             print(f"Error durante limpieza: {e}")
         finally:
-            # Cerrar aplicación
+            # Cerrar aplicación (sin dejar vaciados de estado programados sobre la ventana)
+            self._cancel_status_flush()
             self.root.destroy()
 
     def run(self):
@@ -0,0 +1,68 @@
+# tests/test_automation.py
+"""
+Pruebas de ContactDataExtractor (extracción y deduplicación de contactos)
+"""
+
+import unittest
+
+from whatsapp_automation import ContactDataExtractor
+
+
+class DeduplicateContactsTest(unittest.TestCase):
+    """
+    Los contactos se comparan por número normalizado (solo dígitos)
+    """
+
+    def test_formatting_differences_are_duplicates(self):
+        contacts = ["+52 55 1234 5678", "525512345678", "(52) 55-1234-5678"]
+        self.assertEqual(ContactDataExtractor.deduplicate_contacts(contacts), ["+52 55 1234 5678"])
+
+    def test_keeps_order_and_first_occurrence(self):
+        contacts = [
+            {'nombre': 'Ana', 'numero': '111'},
+            "222",
+            {'nombre': 'Otra Ana', 'numero': '1-1-1'},
+            "333",
+            "222",
+        ]
+        result = ContactDataExtractor.deduplicate_contacts(contacts)
+        self.assertEqual(result, [{'nombre': 'Ana', 'numero': '111'}, "222", "333"])
+
+    def test_mixed_dicts_and_strings(self):
+        contacts = [{'nombre': 'Luis', 'numero': '+1 (555) 000'}, "1555000"]
+        self.assertEqual(len(ContactDataExtractor.deduplicate_contacts(contacts)), 1)
+
+    def test_contacts_without_number_are_kept(self):
+        contacts = [{'nombre': 'Sin número'}, {'nombre': 'Otro sin número'}, ""]
+        self.assertEqual(ContactDataExtractor.deduplicate_contacts(contacts), contacts)
+
+    def test_empty_list(self):
+        self.assertEqual(ContactDataExtractor.deduplicate_contacts([]), [])
+
+
+class ExtractContactDataTest(unittest.TestCase):
+    """
+    Formato estándar {'nombre', 'numero'} para cualquier tipo de contacto
+    """
+
+    def test_dict_contact(self):
+        self.assertEqual(
+            ContactDataExtractor.extract_contact_data({'nombre': 'Ana', 'numero': '123'}),
+            {'nombre': 'Ana', 'numero': '123'}
+        )
+
+    def test_string_contact(self):
+        self.assertEqual(
+            ContactDataExtractor.extract_contact_data("123"),
+            {'nombre': 'Usuario', 'numero': '123'}
+        )
+
+    def test_numeric_contact(self):
+        self.assertEqual(
+            ContactDataExtractor.extract_contact_data(123),
+            {'nombre': 'Usuario', 'numero': '123'}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
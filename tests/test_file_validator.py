@@ -0,0 +1,80 @@
+# tests/test_file_validator.py
+"""
+Pruebas del cache de validación de imágenes de FileValidator
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from whatsapp_utils import FileValidator, WhatsAppConstants
+
+
+class FileValidatorCacheTest(unittest.TestCase):
+    """
+    El cache se indexa por (mtime, tamaño): debe invalidarse cuando el archivo cambia
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.image_path = os.path.join(self.temp_dir, "imagen.png")
+        self._write_file(b"x" * 10)
+        self.validator = FileValidator()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write_file(self, content: bytes, mtime: float = 1_000_000):
+        with open(self.image_path, "wb") as image_file:
+            image_file.write(content)
+        os.utime(self.image_path, (mtime, mtime))
+
+    def test_valid_image_is_cached(self):
+        self.assertTrue(self.validator.validate_image_file(self.image_path))
+        self.assertIn(self.image_path, self.validator._validation_cache)
+        self.assertTrue(self.validator.validate_image_file(self.image_path))
+
+    def test_invalid_extension(self):
+        text_path = os.path.join(self.temp_dir, "notas.txt")
+        with open(text_path, "wb") as text_file:
+            text_file.write(b"hola")
+        self.assertFalse(self.validator.validate_image_file(text_path))
+
+    def test_size_change_invalidates_cache(self):
+        self.assertTrue(self.validator.validate_image_file(self.image_path))
+
+        # Mismo mtime, tamaño por encima del límite
+        oversized = WhatsAppConstants.MAX_FILE_SIZE_BYTES + 1
+        with open(self.image_path, "r+b") as image_file:
+            image_file.truncate(oversized)
+        os.utime(self.image_path, (1_000_000, 1_000_000))
+
+        self.assertFalse(self.validator.validate_image_file(self.image_path))
+
+    def test_mtime_change_invalidates_cache(self):
+        self.assertTrue(self.validator.validate_image_file(self.image_path))
+
+        # Sembrar un resultado distinto para la clave actual: un mtime nuevo debe ignorarlo
+        cache_key, _ = self.validator._validation_cache[self.image_path]
+        self.validator._validation_cache[self.image_path] = (cache_key, False)
+        self.assertFalse(self.validator.validate_image_file(self.image_path))
+
+        os.utime(self.image_path, (2_000_000, 2_000_000))
+        self.assertTrue(self.validator.validate_image_file(self.image_path))
+
+    def test_deleted_file_is_invalid_and_evicted(self):
+        self.assertTrue(self.validator.validate_image_file(self.image_path))
+        os.remove(self.image_path)
+
+        self.assertFalse(self.validator.validate_image_file(self.image_path))
+        self.assertNotIn(self.image_path, self.validator._validation_cache)
+
+    def test_clear_cache(self):
+        self.validator.validate_image_file(self.image_path)
+        self.validator.clear_cache()
+        self.assertEqual(self.validator._validation_cache, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
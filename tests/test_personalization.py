@@ -0,0 +1,94 @@
+# tests/test_personalization.py
+"""
+Pruebas de la detección y aplicación de placeholders en los mensajes
+"""
+
+import unittest
+
+from whatsapp_bot import WhatsAppBot
+from whatsapp_messaging import MessagePersonalizer
+
+
+class CheckMessagePersonalizationTest(unittest.TestCase):
+    """
+    Análisis de personalización de WhatsAppBot.check_message_personalization
+    """
+
+    def setUp(self):
+        self.bot = WhatsAppBot(status_callback=lambda message: None)
+
+    def test_counts_and_normalizes_placeholders(self):
+        messages = [
+            {'texto': 'Hola [Nombre]'},
+            {'texto': 'Tu número es [numero], [NOMBRE]'},
+            {'texto': 'Sin placeholders'},
+            {'imagen': 'foto.png'},
+        ]
+        result = self.bot.check_message_personalization(messages)
+
+        self.assertEqual(result['total_messages'], 4)
+        self.assertEqual(result['personalizable_messages'], 2)
+        self.assertEqual(result['personalization_rate'], 50.0)
+        self.assertEqual(result['placeholders_found'], ['nombre', 'numero'])
+        self.assertTrue(result['has_personalization'])
+
+    def test_no_personalization(self):
+        result = self.bot.check_message_personalization([{'texto': 'Hola'}])
+
+        self.assertEqual(result['personalizable_messages'], 0)
+        self.assertEqual(result['placeholders_found'], [])
+        self.assertFalse(result['has_personalization'])
+
+    def test_empty_list(self):
+        result = self.bot.check_message_personalization([])
+
+        self.assertEqual(result['total_messages'], 0)
+        self.assertEqual(result['personalization_rate'], 0)
+        self.assertFalse(result['has_personalization'])
+
+
+class MessagePersonalizerTest(unittest.TestCase):
+    """
+    Plantillas precalculadas (mark_message) y reemplazo de placeholders
+    """
+
+    def setUp(self):
+        self.personalizer = MessagePersonalizer()
+        self.contact = {'nombre': 'Ana', 'numero': '555'}
+
+    def test_mark_message_does_not_modify_original(self):
+        message = {'texto': ' Hola [nombre] '}
+        marked = MessagePersonalizer.mark_message(message)
+
+        self.assertNotIn('_needs_personalization', message)
+        self.assertTrue(marked['_needs_personalization'])
+        self.assertEqual(marked['_template_parts'], ('Hola ', 'nombre', ''))
+
+    def test_render_matches_personalize_message(self):
+        text = 'Hola [Nombre], tu número [numero] y [otro]'
+        parts = MessagePersonalizer.split_template(text)
+
+        self.assertEqual(
+            self.personalizer.render_template(parts, self.contact),
+            self.personalizer.personalize_message(text, self.contact)
+        )
+        self.assertEqual(
+            self.personalizer.personalize_message(text, self.contact),
+            'Hola Ana, tu número 555 y [otro]'
+        )
+
+    def test_contact_values_are_inserted_literally(self):
+        contact = {'nombre': r'A\1 [numero]', 'numero': '555'}
+        self.assertEqual(
+            self.personalizer.personalize_message('[nombre]', contact),
+            r'A\1 [numero]'
+        )
+
+    def test_needs_personalization_without_mark(self):
+        self.assertTrue(MessagePersonalizer.needs_personalization({'texto': '[nombre]'}))
+        self.assertFalse(MessagePersonalizer.needs_personalization({'texto': 'hola'}))
+        self.assertFalse(MessagePersonalizer.needs_personalization({}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# tests/test_user_data_manager.py
+"""
+Pruebas de la reserva de directorios de datos de usuario entre gestores del mismo proceso
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from whatsapp_driver import ChromeUserDataManager
+
+
+class UserDataDirectoryClaimTest(unittest.TestCase):
+    """
+    Un directorio reservado por un gestor no se entrega a otro ni se borra
+    """
+
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        ChromeUserDataManager._claimed_directories.clear()
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        ChromeUserDataManager._claimed_directories.clear()
+
+    def test_base_directory_not_shared_before_it_exists(self):
+        first = ChromeUserDataManager()
+        second = ChromeUserDataManager()
+
+        first_dir = first.get_available_user_data_dir()
+        second_dir = second.get_available_user_data_dir()
+
+        self.assertEqual(first_dir, first.base_user_data_dir)
+        self.assertNotEqual(second_dir, first_dir)
+
+    def test_release_makes_base_directory_available_again(self):
+        first = ChromeUserDataManager()
+        first.get_available_user_data_dir()
+        first.release_current_directory()
+
+        second = ChromeUserDataManager()
+        self.assertEqual(second.get_available_user_data_dir(), second.base_user_data_dir)
+
+    def test_cleanup_skips_directory_claimed_by_other(self):
+        first = ChromeUserDataManager()
+        base_dir = first.get_available_user_data_dir()
+        os.makedirs(base_dir)
+        first.release_current_directory()
+
+        second = ChromeUserDataManager()
+        self.assertEqual(second.get_available_user_data_dir(), base_dir)
+
+        first.cleanup_current_directory()
+        self.assertTrue(os.path.exists(base_dir))
+
+        second.cleanup_current_directory()
+        self.assertFalse(os.path.exists(base_dir))
+        self.assertEqual(ChromeUserDataManager._claimed_directories, set())
+
+    def test_unique_directory_is_claimed(self):
+        first = ChromeUserDataManager()
+        first.get_available_user_data_dir()
+        unique_dir = first.claim_unique_directory()
+
+        self.assertEqual(first.current_user_data_dir, unique_dir)
+        self.assertEqual(ChromeUserDataManager._claimed_directories, {unique_dir})
+
+        # La reserva del directorio base se liberó al cambiar de directorio
+        second = ChromeUserDataManager()
+        self.assertEqual(second.get_available_user_data_dir(), second.base_user_data_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,7 @@ personalización automática de mensajes con placeholders como [nombre] para cad
 y gestión inteligente de instancias de navegador para evitar conflictos.
 """
 
+import re
 import time
 import random
 import threading
@@ -16,7 +17,11 @@ from whatsapp_utils import WhatsAppConstants, UnicodeHandler
 from whatsapp_driver import ChromeDriverManager
 from whatsapp_session import WhatsAppSession
 from whatsapp_contacts import ContactManager
-from whatsapp_messaging import MessageSender
+from whatsapp_messaging import MessageSender, MessagePersonalizer
+
+
+# Normalización de números para detectar contactos repetidos (igual que ContactManager)
+_NON_DIGIT_RE = re.compile(r'[^0-9]')
 
 
 class AutomationStats:
@@ -174,7 +179,8 @@ class SequentialMessageManager:
     """
 
     def __init__(self, messages: List[Dict[str, Any]]):
-        self.messages = messages.copy()
+        # Instantánea inmutable: solo se lee durante la automatización
+        self.messages = tuple(messages)
         self.current_index = 0
         self.total_messages = len(messages)
 
@@ -256,6 +262,30 @@ class ContactDataExtractor:
                 'numero': ''
             }
 
+    @classmethod
+    def deduplicate_contacts(cls, contacts_data: List[Any]) -> List[Any]:
+        """
+        Elimina contactos repetidos comparando el número normalizado (solo dígitos)
+
+        Args:
+            contacts_data: Lista de contactos (números o contactos completos)
+
+        Returns:
+            Lista sin repetidos, conservando el orden y la primera aparición
+        """
+        seen_numbers = set()
+        unique_contacts = []
+
+        for contact_info in contacts_data:
+            number = _NON_DIGIT_RE.sub('', str(cls.extract_contact_data(contact_info)['numero']))
+            if number:
+                if number in seen_numbers:
+                    continue
+                seen_numbers.add(number)
+            unique_contacts.append(contact_info)
+
+        return unique_contacts
+
 
 class BrowserInstanceManager:
     """
@@ -266,6 +296,8 @@ class BrowserInstanceManager:
         self._shared_driver_manager = None
         self._browser_should_stay_open = False
         self._instance_lock = threading.Lock()
+        # Gestores que se están cerrando en segundo plano (su directorio puede estar borrándose)
+        self._closing_driver_managers: List[ChromeDriverManager] = []
 
     def get_or_create_driver_manager(self, status_callback: Optional[Callable] = None) -> ChromeDriverManager:
         """
@@ -284,6 +316,15 @@ class BrowserInstanceManager:
                     status_callback("🔄 Reutilizando navegador existente...")
                 return self._shared_driver_manager
 
+            # Esperar a que el cierre anterior termine: su quit y el borrado de su directorio
+            # deben acabar antes de que el nuevo gestor elija directorio de datos
+            if self._closing_driver_managers:
+                if status_callback:
+                    status_callback("⏳ Esperando el cierre del navegador anterior...")
+                for closing_manager in self._closing_driver_managers:
+                    closing_manager.wait_until_closed()
+                self._closing_driver_managers.clear()
+
             # Si la instancia anterior no está activa, crear nueva
             if status_callback:
                 status_callback("🚀 Creando nueva instancia de navegador...")
@@ -311,7 +352,10 @@ class BrowserInstanceManager:
         with self._instance_lock:
             if force_close or not self._browser_should_stay_open:
                 if driver_manager:
-                    driver_manager.close(cleanup_user_data=not self._browser_should_stay_open)
+                    # Cierre en segundo plano: la instancia se descarta y la próxima
+                    # automatización crea un gestor nuevo
+                    driver_manager.close(cleanup_user_data=not self._browser_should_stay_open, wait=False)
+                    self._closing_driver_managers.append(driver_manager)
 
                 # Si es la instancia compartida y se está cerrando, limpiar referencia
                 if driver_manager == self._shared_driver_manager and not self._browser_should_stay_open:
@@ -346,6 +390,10 @@ class AutomationController:
         self.status_callback = status_callback
         self.is_running = False
         self._stop_requested = False
+        # Permite interrumpir al instante la espera entre mensajes
+        self._stop_event = threading.Event()
+        # Momento (time.monotonic) a partir del cual se permite el siguiente envío
+        self._next_send_allowed_at = 0.0
 
         # Componentes principales (MEJORADO: usar gestor de instancias)
         self.driver_manager = None
@@ -369,9 +417,11 @@ class AutomationController:
         Args:
             message: Mensaje de estado
         """
-        print(f"[Automation] {message}")
+        # Con callback la GUI ya muestra el mensaje; stdout solo se usa sin GUI
         if self.status_callback:
             self.status_callback(message)
+        else:
+            print(f"[Automation] {message}")
 
     def _initialize_components(self) -> bool:
         """
@@ -483,7 +533,7 @@ class AutomationController:
         return True
 
     def _create_message_display_info(self, message_data: Dict[str, Any], cycle_position: int,
-                                     total_messages: int, contact_data: Dict[str, str]) -> str:
+                                     total_messages: int) -> str:
         """
         Crea información de visualización para un mensaje con indicadores de personalización
 
@@ -491,7 +541,6 @@ class AutomationController:
             message_data: Datos del mensaje
             cycle_position: Posición en el ciclo
             total_messages: Total de mensajes
-            contact_data: Datos del contacto
 
         Returns:
             String con información formateada del mensaje
@@ -501,10 +550,7 @@ class AutomationController:
         envio_conjunto = message_data.get('envio_conjunto', False)
 
         # Verificar si el mensaje será personalizado
-        will_be_personalized = False
-        if self.message_sender and text:
-            personalizer = self.message_sender.get_personalizer()
-            will_be_personalized = personalizer.has_placeholders(text)
+        will_be_personalized = MessagePersonalizer.needs_personalization(message_data)
 
         # Texto truncado
         display_text = text[:50] + "..." if len(text) > 50 else text
@@ -552,7 +598,7 @@ class AutomationController:
             if isinstance(contact_info, str):
                 phone_number = contact_info
             elif isinstance(contact_info, dict):
-                phone_number = contact_info.get('numero', contact_info.get('number', ''))
+                phone_number = contact_info.get('numero') or contact_info.get('number') or ''
 
             # Verificar sesión activa
             if not self.session_manager.validate_session():
@@ -568,10 +614,7 @@ class AutomationController:
             # Enviar mensaje con datos de contacto para personalización
             if self.message_sender.send_message(message_data, contact_data):
                 # Verificar si se personalizó el mensaje
-                was_personalized = False
-                if self.message_sender and message_data.get('texto'):
-                    personalizer = self.message_sender.get_personalizer()
-                    was_personalized = personalizer.has_placeholders(message_data.get('texto', ''))
+                was_personalized = MessagePersonalizer.needs_personalization(message_data)
 
                 if was_personalized:
                     self._update_status(f"✅ Mensaje personalizado enviado a {contact_data.get('nombre', phone_number)}")
@@ -591,18 +634,22 @@ class AutomationController:
         """
         Espera el intervalo configurado entre mensajes
 
+        El intervalo se cuenta desde el inicio del envío anterior, así el tiempo que
+        tardó el envío forma parte de la pausa en lugar de sumarse a ella.
+
         Args:
             current_index: Índice actual
             total_contacts: Total de contactos
         """
         if current_index < total_contacts - 1 and self.is_running:
-            wait_time = random.randint(self.min_interval, self.max_interval)
-            self._update_status(f"⏱ Esperando {wait_time} segundos antes del siguiente mensaje...")
+            wait_time = self._next_send_allowed_at - time.monotonic()
+            if wait_time <= 0:
+                return
 
-            for _ in range(wait_time):
-                if not self.is_running:
-                    break
-                time.sleep(1)
+            self._update_status(f"⏱ Esperando {wait_time:.0f} segundos antes del siguiente mensaje...")
+
+            # Espera bloqueante que despierta en cuanto se solicita la detención
+            self._stop_event.wait(timeout=wait_time)
 
     def _show_failed_contacts_summary(self):
         """
@@ -639,25 +686,37 @@ class AutomationController:
             self.max_interval = max_interval
             self.is_running = True
             self._stop_requested = False
+            self._stop_event.clear()
 
             # Validar datos
             if not self._validate_automation_data(contacts_data, messages):
                 self.is_running = False
                 return
 
+            # Un mismo número con distinto formato (+57 300..., 57300...) abriría el chat dos veces
+            unique_contacts = self.contact_extractor.deduplicate_contacts(contacts_data)
+            if len(unique_contacts) < len(contacts_data):
+                self._update_status(
+                    f"🔁 {len(contacts_data) - len(unique_contacts)} contacto(s) repetido(s) omitido(s)"
+                )
+                contacts_data = unique_contacts
+
             # Inicializar estadísticas
             self.stats.start_session(len(contacts_data), len(messages))
 
             # Crear gestor de mensajes secuencial
             self.message_manager = SequentialMessageManager(messages)
 
+            # La información de display solo depende del mensaje: calcularla una vez por mensaje
+            message_display_infos = [
+                self._create_message_display_info(message, index + 1, len(messages))
+                for index, message in enumerate(messages)
+            ]
+
             # Detectar si hay mensajes con personalización
-            personalizable_messages = 0
-            if self.message_sender:
-                personalizer = self.message_sender.get_personalizer()
-                for msg in messages:
-                    if personalizer.has_placeholders(msg.get('texto', '')):
-                        personalizable_messages += 1
+            personalizable_messages = sum(
+                1 for msg in messages if MessagePersonalizer.needs_personalization(msg)
+            )
 
             self._update_status("🚀 Iniciando automatización con envío secuencial...")
             self._update_status(f"📊 {len(contacts_data)} contactos, {len(messages)} mensajes")
@@ -691,23 +750,23 @@ class AutomationController:
                     self.stats.record_contact_processed(contact_info)
                     self.stats.update_message_index(cycle_position)
 
-                    # Crear información de display
-                    message_info = self._create_message_display_info(
-                        current_message, cycle_position, total_msgs, contact_data
-                    )
+                    # Información de display precalculada (la posición 0 del ciclo es el último mensaje)
+                    message_info = message_display_infos[(cycle_position - 1) % total_msgs]
 
                     contact_display = contact_data.get('nombre', contact_data.get('numero', str(contact_info)))
                     self._update_status(f"📱 ({i + 1}/{len(contacts_data)}) {message_info} → {contact_display}")
 
+                    # Reservar el intervalo aleatorio a partir del inicio de este envío
+                    self._next_send_allowed_at = (
+                        time.monotonic() + random.randint(self.min_interval, self.max_interval)
+                    )
+
                     # Enviar mensaje con personalización
                     success = self._send_to_single_contact(contact_info, current_message)
 
                     if success:
                         # Verificar si se personalizó
-                        was_personalized = False
-                        if current_message.get('texto') and self.message_sender:
-                            personalizer = self.message_sender.get_personalizer()
-                            was_personalized = personalizer.has_placeholders(current_message.get('texto', ''))
+                        was_personalized = MessagePersonalizer.needs_personalization(current_message)
 
                         self.stats.record_message_sent(was_personalized)
                     else:
@@ -765,6 +824,7 @@ class AutomationController:
             self._update_status("🛑 Solicitando detención de automatización...")
             self.is_running = False
             self._stop_requested = True
+            self._stop_event.set()
         else:
             self._update_status("ℹ️ No hay automatización en ejecución")
 
@@ -814,6 +874,7 @@ class AutomationController:
         try:
             self.is_running = False
             self._stop_requested = True
+            self._stop_event.set()
             _browser_instance_manager.force_cleanup_all()
             self._update_status("🧹 Limpieza forzada completada")
         except Exception as e:
@@ -10,12 +10,13 @@ del navegador y gestión inteligente de instancias para evitar conflictos.
 """
 
 import threading
+import time
 from typing import List, Dict, Any, Optional, Callable, Union
 from whatsapp_automation import AutomationController
 from whatsapp_driver import ChromeDriverManager
 from whatsapp_session import WhatsAppSession
 from whatsapp_contacts import ContactManager
-from whatsapp_messaging import MessageSender
+from whatsapp_messaging import MessageSender, MessagePersonalizer
 
 
 class WhatsAppBot:
@@ -26,6 +27,23 @@ class WhatsAppBot:
     y gestión inteligente de instancias de navegador para evitar conflictos
     """
 
+    # Atributos fijos: evita el __dict__ por instancia y detecta errores de tipeo
+    __slots__ = (
+        'status_callback',
+        'automation_controller',
+        '_standalone_driver',
+        '_standalone_session',
+        '_standalone_contacts',
+        '_standalone_messaging',
+        '_automation_thread',
+        '_is_standalone_mode',
+        '_session_info_cache',
+        '_session_info_ts',
+    )
+
+    # Vigencia (segundos) del snapshot de get_session_info en modo standalone
+    SESSION_INFO_TTL = 0.5
+
     def __init__(self, status_callback: Optional[Callable] = None):
         """
         Inicializa el bot de WhatsApp
@@ -50,6 +68,10 @@ class WhatsAppBot:
         # NUEVO: Control de estado para evitar conflictos
         self._is_standalone_mode = False
 
+        # Snapshot de la información de sesión para evitar consultas repetidas al driver
+        self._session_info_cache = None
+        self._session_info_ts = 0.0
+
     def _update_status(self, message: str):
         """
         Actualiza el estado y notifica a la GUI
@@ -57,9 +79,11 @@ class WhatsAppBot:
         Args:
             message: Mensaje de estado
         """
-        print(f"[Bot] {message}")
+        # Con callback la GUI ya muestra el mensaje; stdout solo se usa sin GUI
         if self.status_callback:
             self.status_callback(message)
+        else:
+            print(f"[Bot] {message}")
 
     def _initialize_standalone_components(self) -> bool:
         """
@@ -76,11 +100,19 @@ class WhatsAppBot:
 
             # Marcar modo standalone
             self._is_standalone_mode = True
+            self._invalidate_session_info()
 
             if not self._standalone_driver:
                 self._standalone_driver = ChromeDriverManager(self.status_callback)
+
                 if not self._standalone_driver.initialize_driver():
+                    # Cerrar antes de descartar: libera la reserva del directorio de datos
+                    self._standalone_driver.close(cleanup_user_data=False)
+                    self._standalone_driver = None
+                    self._standalone_contacts = None
+                    self._standalone_messaging = None
                     self._is_standalone_mode = False
+                    self._invalidate_session_info()
                     return False
 
             if not self._standalone_session:
@@ -93,10 +125,12 @@ class WhatsAppBot:
                     if not self._standalone_session.validate_session():
                         if not self._standalone_session.open_whatsapp_web():
                             self._is_standalone_mode = False
+                            self._invalidate_session_info()
                             return False
                 else:
                     if not self._standalone_session.open_whatsapp_web():
                         self._is_standalone_mode = False
+                        self._invalidate_session_info()
                         return False
 
             if not self._standalone_contacts:
@@ -105,11 +139,14 @@ class WhatsAppBot:
             if not self._standalone_messaging:
                 self._standalone_messaging = MessageSender(self._standalone_driver, self.status_callback)
 
+            # El estado cambió durante la inicialización: descartar la información cacheada
+            self._invalidate_session_info()
             return True
 
         except Exception as e:
             self._update_status(f"Error inicializando componentes: {str(e)}")
             self._is_standalone_mode = False
+            self._invalidate_session_info()
             return False
 
     def _cleanup_standalone_components(self):
@@ -119,6 +156,7 @@ class WhatsAppBot:
         """
         try:
             self._is_standalone_mode = False
+            self._invalidate_session_info()
 
             if self._standalone_contacts:
                 self._standalone_contacts.clear_cache()
@@ -143,6 +181,16 @@ class WhatsAppBot:
         except Exception as e:
             self._update_status(f"Error en limpieza: {str(e)}")
 
+        finally:
+            # Las referencias ya cambiaron: no servir información de sesión anterior
+            self._invalidate_session_info()
+
+    def _invalidate_session_info(self):
+        """
+        Descarta el snapshot de información de sesión tras un cambio de estado
+        """
+        self._session_info_cache = None
+
     def _prepare_contacts_data(self, contacts_input: Union[List[str], List[Dict[str, str]]]) -> List[Any]:
         """
         Prepara los datos de contactos para automatización con soporte de personalización
@@ -236,14 +284,10 @@ class WhatsAppBot:
             # Preparar datos de contactos para soporte de personalización
             prepared_contacts = self._prepare_contacts_data(phone_numbers)
 
-            # Detectar si hay mensajes con personalización
-            personalization_detected = False
-            if messages:
-                for message in messages:
-                    text = message.get('texto', '')
-                    if '[nombre]' in text.lower() or '[numero]' in text.lower():
-                        personalization_detected = True
-                        break
+            # Detectar personalización una sola vez y guardarla en cada mensaje
+            mark = MessagePersonalizer.mark_message
+            messages = [mark(message) for message in messages or []]
+            personalization_detected = any(message['_needs_personalization'] for message in messages)
 
             if personalization_detected:
                 self._update_status("👤 Personalización detectada en mensajes - se aplicará automáticamente")
@@ -356,7 +400,7 @@ class WhatsAppBot:
             True si se envió correctamente
         """
         try:
-            phone_number = contact_info.get('numero', contact_info.get('number', ''))
+            phone_number = contact_info.get('numero') or contact_info.get('number') or ''
             if not phone_number:
                 self._update_status("❌ Número de teléfono no válido en contacto")
                 return False
@@ -387,6 +431,11 @@ class WhatsAppBot:
 
             return session_info
 
+        # Reutilizar el snapshot reciente para no repetir llamadas al driver
+        now = time.monotonic()
+        if self._session_info_cache is not None and now - self._session_info_ts < self.SESSION_INFO_TTL:
+            return self._session_info_cache.copy()
+
         # Si no hay automatización, usar componentes standalone
         info = {
             'is_running': False,
@@ -406,7 +455,9 @@ class WhatsAppBot:
         if self._standalone_session:
             info['session_valid'] = self._standalone_session.is_session_valid()
 
-        return info
+        self._session_info_cache = info
+        self._session_info_ts = now
+        return info.copy()
 
     def get_current_stats(self) -> Dict[str, Any]:
         """
@@ -530,6 +581,7 @@ class WhatsAppBot:
                 return False
 
             if self._standalone_session:
+                self._invalidate_session_info()
                 return self._standalone_session.refresh_session()
             return False
         except Exception as e:
@@ -551,6 +603,7 @@ class WhatsAppBot:
 
             # Si no, usar standalone
             if self._standalone_session:
+                self._invalidate_session_info()
                 return self._standalone_session.validate_session()
             return False
         except Exception as e:
@@ -603,16 +656,16 @@ class WhatsAppBot:
                 text = message.get('texto', '')
                 if personalizer.has_placeholders(text):
                     personalizable_messages += 1
-                    # Encontrar placeholders específicos
-                    import re
-                    found = re.findall(r'\[(\w+)\]', text, re.IGNORECASE)
-                    placeholders_found.update(found)
+                    # Encontrar placeholders específicos (normalizados a minúsculas)
+                    placeholders_found.update(
+                        found.lower() for found in personalizer.placeholder_pattern.findall(text)
+                    )
 
             return {
                 'total_messages': total_messages,
                 'personalizable_messages': personalizable_messages,
                 'personalization_rate': (personalizable_messages / max(1, total_messages)) * 100,
-                'placeholders_found': list(placeholders_found),
+                'placeholders_found': sorted(placeholders_found),
                 'has_personalization': personalizable_messages > 0
             }
 
@@ -8,9 +8,10 @@ apertura de conversaciones y validación de números de teléfono.
 
 import time
 import re
+from collections import OrderedDict
 from typing import Optional, Callable, Dict, Set
 from selenium.webdriver.common.keys import Keys
-from whatsapp_utils import WhatsAppConstants
+from whatsapp_utils import WhatsAppConstants, JavaScriptInjector
 from whatsapp_driver import ChromeDriverManager
 
 
@@ -34,6 +35,8 @@ class ContactManager:
         self._contact_cache: Dict[str, bool] = {}  # phone -> conversation_opened
         self._last_opened_contact: Optional[str] = None
         self._validated_numbers: Set[str] = set()
+        # phone -> estrategia que abrió la conversación ('input' o 'url'), LRU acotado
+        self._open_strategy_cache: "OrderedDict[str, str]" = OrderedDict()
 
     def _update_status(self, message: str):
         """
@@ -42,9 +45,11 @@ class ContactManager:
         Args:
             message: Mensaje de estado
         """
-        print(f"[Contacts] {message}")
+        # Con callback la GUI ya muestra el mensaje; stdout solo se usa sin GUI
         if self.status_callback:
             self.status_callback(message)
+        else:
+            print(f"[Contacts] {message}")
 
     def _clean_phone_number(self, phone_number: str) -> str:
         """
@@ -109,10 +114,7 @@ class ContactManager:
 
             # Si es el mismo contacto que antes, verificar rápidamente
             if self._last_opened_contact == cleaned_number:
-                message_box = self.driver_manager.wait_for_element(
-                    WhatsAppConstants.SELECTORS['message_box'],
-                    timeout=2
-                )
+                message_box = self.driver_manager.get_cached_element('message_box', timeout=2)
                 return message_box is not None
 
             return False
@@ -134,8 +136,8 @@ class ContactManager:
             cleaned_number = self._clean_phone_number(phone_number)
 
             # Buscar campo de búsqueda
-            search_box = self.driver_manager.wait_for_element(
-                WhatsAppConstants.SELECTORS['search_box'],
+            search_box = self.driver_manager.get_cached_element(
+                'search_box',
                 timeout=WhatsAppConstants.ELEMENT_WAIT_TIMEOUT,
                 clickable=True
             )
@@ -148,18 +150,40 @@ class ContactManager:
             if not self.driver_manager.safe_click(search_box):
                 return False
 
+            # Los resultados de la búsqueda anterior siguen en pantalla: marcarlos para que no
+            # cuenten como resultados del número nuevo
+            search_result_selectors = [
+                "div[aria-label*='Resultados de la búsqueda'] div[role='listitem']",
+                "#pane-side span.matched-text",
+                "div[data-testid='search-results'] div[role='listitem']"
+            ]
+            self.driver_manager.execute_script(
+                JavaScriptInjector.MARK_SEARCH_RESULTS_SCRIPT, search_result_selectors
+            )
+
             # Limpiar campo y escribir número
             search_box.clear()
-            time.sleep(WhatsAppConstants.SHORT_DELAY)
-
             search_box.send_keys(cleaned_number)
-            time.sleep(1.5)  # Tiempo para que aparezcan resultados
+
+            # Esperar a que WhatsApp filtre los resultados para este número: ENTER sobre los
+            # resultados anteriores abriría otra conversación
+            results_ready = self.driver_manager.wait_until(
+                lambda driver: driver.execute_script(
+                    JavaScriptInjector.SEARCH_RESULTS_READY_SCRIPT,
+                    search_result_selectors,
+                    cleaned_number
+                ),
+                timeout=WhatsAppConstants.SEARCH_RESULTS_TIMEOUT,
+                poll_frequency=0.1
+            )
+            if not results_ready:
+                self._update_status(f"Sin resultados de búsqueda para {cleaned_number}")
+                return False
 
             # Presionar Enter para seleccionar
             search_box.send_keys(Keys.ENTER)
-            time.sleep(WhatsAppConstants.LONG_DELAY)
 
-            # Verificar si se abrió la conversación
+            # Verificar si se abrió la conversación (espera explícita al campo de mensaje)
             return self._verify_conversation_opened()
 
         except Exception as e:
@@ -182,12 +206,15 @@ class ContactManager:
 
             self._update_status(f"Abriendo {cleaned_number} con URL directa...")
 
-            if not self.driver_manager.navigate_to(whatsapp_url):
-                return False
-
-            time.sleep(3)  # Tiempo para carga de la página
+            # Reintentar solo la navegación (fallos transitorios del driver) con backoff
+            for attempt in range(WhatsAppConstants.NAVIGATION_ATTEMPTS):
+                if self.driver_manager.navigate_to(whatsapp_url):
+                    break
+                if attempt == WhatsAppConstants.NAVIGATION_ATTEMPTS - 1:
+                    return False
+                time.sleep(self.driver_manager.backoff_delay(attempt))
 
-            # Verificar si se abrió la conversación
+            # Verificar si se abrió la conversación (espera explícita al campo de mensaje)
             return self._verify_conversation_opened()
 
         except Exception as e:
@@ -203,10 +230,7 @@ class ContactManager:
         """
         try:
             # Buscar campo de mensaje para confirmar conversación abierta
-            message_box = self.driver_manager.wait_for_element(
-                WhatsAppConstants.SELECTORS['message_box'],
-                timeout=8
-            )
+            message_box = self.driver_manager.get_cached_element('message_box', timeout=8)
 
             if message_box:
                 return True
@@ -247,8 +271,8 @@ class ContactManager:
 
             cleaned_number = self._clean_phone_number(phone_number)
 
-            # Verificar si el driver está activo
-            if not self.driver_manager.is_session_alive():
+            # Verificar si el driver está activo (reutiliza una verificación reciente)
+            if not self.driver_manager.is_session_alive(max_age=WhatsAppConstants.SESSION_CHECK_MAX_AGE):
                 self._update_status("Sesión perdida, no se puede abrir contacto")
                 return False
 
@@ -259,20 +283,30 @@ class ContactManager:
 
             self._update_status(f"📱 Abriendo conversación con {cleaned_number}...")
 
-            # Estrategia 1: Búsqueda por campo de input
-            if self._search_contact_by_input(cleaned_number):
-                self._last_opened_contact = cleaned_number
-                self._contact_cache[cleaned_number] = True
-                self._update_status(f"✅ Conversación abierta con {cleaned_number} (búsqueda)")
-                return True
+            # Nueva conversación: el campo de mensaje cacheado pertenece a la anterior, y si
+            # la apertura falla a mitad no se sabe qué chat queda en pantalla
+            self.driver_manager.invalidate_element_cache('message_box')
+            self._last_opened_contact = None
 
-            # Estrategia 2: URL directa como fallback
-            self._update_status("Intentando con URL directa...")
-            if self._search_contact_by_url(cleaned_number):
-                self._last_opened_contact = cleaned_number
-                self._contact_cache[cleaned_number] = True
-                self._update_status(f"✅ Conversación abierta con {cleaned_number} (URL)")
-                return True
+            # Empezar por la estrategia que ya funcionó con este número (p. ej. un número
+            # que no es contacto guardado no aparece en la búsqueda y solo abre por URL)
+            strategies = [
+                ('input', self._search_contact_by_input, "búsqueda"),
+                ('url', self._search_contact_by_url, "URL")
+            ]
+            if self._open_strategy_cache.get(cleaned_number) == 'url':
+                strategies.reverse()
+
+            for index, (strategy_key, open_strategy, strategy_label) in enumerate(strategies):
+                if index > 0 and strategy_key == 'url':
+                    self._update_status("Intentando con URL directa...")
+
+                if open_strategy(cleaned_number):
+                    self._last_opened_contact = cleaned_number
+                    self._contact_cache[cleaned_number] = True
+                    self._remember_open_strategy(cleaned_number, strategy_key)
+                    self._update_status(f"✅ Conversación abierta con {cleaned_number} ({strategy_label})")
+                    return True
 
             # Si ninguna estrategia funcionó
             self._update_status(f"❌ No se pudo abrir conversación con {cleaned_number}")
@@ -283,6 +317,19 @@ class ContactManager:
             self._update_status(f"❌ Error al abrir contacto {phone_number}: {str(e)}")
             return False
 
+    def _remember_open_strategy(self, phone_number: str, strategy_key: str):
+        """
+        Guarda la estrategia que abrió la conversación con un número
+
+        Args:
+            phone_number: Número limpio del contacto
+            strategy_key: Estrategia usada ('input' o 'url')
+        """
+        self._open_strategy_cache[phone_number] = strategy_key
+        self._open_strategy_cache.move_to_end(phone_number)
+        if len(self._open_strategy_cache) > WhatsAppConstants.CONTACT_STRATEGY_CACHE_SIZE:
+            self._open_strategy_cache.popitem(last=False)
+
     def close_current_conversation(self) -> bool:
         """
         Cierra la conversación actual y regresa a la lista de chats
@@ -307,7 +354,7 @@ class ContactManager:
 
             if close_button and self.driver_manager.safe_click(close_button):
                 self._last_opened_contact = None
-                time.sleep(WhatsAppConstants.SHORT_DELAY)
+                self._wait_until_conversation_closed()
                 return True
 
             # Método alternativo: presionar Escape
@@ -316,7 +363,7 @@ class ContactManager:
                 if body:
                     body.send_keys(Keys.ESCAPE)
                     self._last_opened_contact = None
-                    time.sleep(WhatsAppConstants.SHORT_DELAY)
+                    self._wait_until_conversation_closed()
                     return True
             except:
                 pass
@@ -327,6 +374,24 @@ class ContactManager:
             self._update_status(f"Error cerrando conversación: {str(e)}")
             return False
 
+    def _wait_until_conversation_closed(self) -> bool:
+        """
+        Espera a que desaparezca la caja de mensaje de la conversación cerrada
+
+        Returns:
+            True si la conversación se cerró antes del timeout
+        """
+        self.driver_manager.invalidate_element_cache('message_box')
+        message_box_selectors = WhatsAppConstants.get_selectors('message_box')
+
+        return self.driver_manager.wait_until(
+            lambda driver: driver.execute_script(
+                JavaScriptInjector.FIRST_MATCH_SCRIPT, message_box_selectors
+            ) is None,
+            timeout=WhatsAppConstants.MEDIUM_DELAY,
+            poll_frequency=0.05
+        )
+
     def get_current_contact_info(self) -> Optional[Dict[str, str]]:
         """
         Obtiene información del contacto actual
@@ -371,6 +436,7 @@ class ContactManager:
         Limpia el cache de contactos
         """
         self._contact_cache.clear()
+        self._open_strategy_cache.clear()
         self._last_opened_contact = None
         self._validated_numbers.clear()
         self._update_status("Cache de contactos limpiado")
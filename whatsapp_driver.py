@@ -9,17 +9,19 @@ resolución automática de conflictos de directorio de datos de usuario.
 
 import os
 import time
+import random
 import shutil
 import psutil
 import tempfile
-from typing import Optional, Callable
+import threading
+from typing import Optional, Callable, Dict, Any, Set
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from whatsapp_utils import WhatsAppConstants
+from selenium.common.exceptions import (TimeoutException, WebDriverException, StaleElementReferenceException,
+                                        InvalidSelectorException)
+from whatsapp_utils import WhatsAppConstants, JavaScriptInjector
 
 
 class ChromeUserDataManager:
@@ -27,9 +29,20 @@ class ChromeUserDataManager:
     Gestor especializado para manejar directorios de datos de usuario de Chrome
     """
 
+    # Archivos de bloqueo que Chrome crea en el perfil mientras lo usa (Linux/macOS y Windows)
+    PROFILE_LOCK_FILES = ("SingletonLock", "lockfile")
+
+    # Compartidos por todas las instancias del proceso: la elección y el borrado de directorios
+    # se serializan, y un directorio reservado por un gestor (aunque Chrome aún no haya creado
+    # su archivo de bloqueo) no se considera libre ni se borra. Solo se guardan rutas
+    _directory_lock = threading.Lock()
+    _claimed_directories: Set[str] = set()
+
     def __init__(self):
         self.base_user_data_dir = os.path.join(os.getcwd(), "chrome_user_data")
         self.current_user_data_dir = None
+        # Ruta que esta instancia tiene reservada en _claimed_directories (None si ninguna)
+        self._claimed_dir: Optional[str] = None
 
     def get_available_user_data_dir(self) -> str:
         """
@@ -38,20 +51,73 @@ class ChromeUserDataManager:
         Returns:
             Ruta del directorio disponible
         """
-        # Intentar usar el directorio base primero
-        if self._is_directory_available(self.base_user_data_dir):
-            self.current_user_data_dir = self.base_user_data_dir
-            return self.base_user_data_dir
+        with self._directory_lock:
+            self._release_claim()
+            base_dir = self.base_user_data_dir
+
+            # Intentar usar el directorio base primero; si no está disponible, intentar limpiarlo.
+            # La reserva de otro gestor se comprueba antes que cualquier atajo (existencia,
+            # archivo de bloqueo): Chrome puede no haber creado todavía el perfil
+            if not self._is_claimed_by_other(base_dir) and (
+                    self._is_directory_available(base_dir) or self._try_cleanup_directory(base_dir)):
+                user_data_dir = base_dir
+            else:
+                # Como último recurso, crear directorio único
+                user_data_dir = self._create_unique_directory()
+
+            self._claim(user_data_dir)
+            return user_data_dir
+
+    def claim_unique_directory(self) -> str:
+        """
+        Reserva un directorio único nuevo (reintento tras fallar con el directorio disponible)
+
+        Returns:
+            Ruta del directorio único reservado
+        """
+        with self._directory_lock:
+            self._release_claim()
+            user_data_dir = self._create_unique_directory()
+            self._claim(user_data_dir)
+            return user_data_dir
+
+    def _claim(self, directory_path: str):
+        """
+        Reserva un directorio como el actual de esta instancia (llamar con _directory_lock tomado)
+
+        Args:
+            directory_path: Ruta del directorio
+        """
+        self.current_user_data_dir = directory_path
+        self._claimed_dir = directory_path
+        self._claimed_directories.add(directory_path)
+
+    def _release_claim(self):
+        """
+        Libera la reserva de esta instancia (llamar con _directory_lock tomado)
+        """
+        if self._claimed_dir is not None:
+            self._claimed_directories.discard(self._claimed_dir)
+            self._claimed_dir = None
+
+    def _is_claimed_by_other(self, directory_path: str) -> bool:
+        """
+        Verifica si otro gestor de este proceso reservó el directorio
+
+        Args:
+            directory_path: Ruta del directorio
 
-        # Si no está disponible, intentar limpiarlo
-        if self._try_cleanup_directory(self.base_user_data_dir):
-            self.current_user_data_dir = self.base_user_data_dir
-            return self.base_user_data_dir
+        Returns:
+            True si está reservado por otra instancia
+        """
+        return directory_path in self._claimed_directories and directory_path != self._claimed_dir
 
-        # Como último recurso, crear directorio único
-        unique_dir = self._create_unique_directory()
-        self.current_user_data_dir = unique_dir
-        return unique_dir
+    def release_current_directory(self):
+        """
+        Libera la reserva del directorio actual sin borrarlo (el perfil se conserva)
+        """
+        with self._directory_lock:
+            self._release_claim()
 
     def _is_directory_available(self, directory_path: str) -> bool:
         """
@@ -64,6 +130,10 @@ class ChromeUserDataManager:
             True si está disponible
         """
         try:
+            # Reservado por otro gestor de este proceso (Chrome puede estar arrancando)
+            if self._is_claimed_by_other(directory_path):
+                return False
+
             # Si no existe, está disponible
             if not os.path.exists(directory_path):
                 return True
@@ -84,11 +154,17 @@ class ChromeUserDataManager:
         Returns:
             True si Chrome está usando el directorio
         """
+        # Sin archivo de bloqueo ningún Chrome tiene abierto el perfil: evitar recorrer los procesos.
+        # Si existe (puede quedar tras un cierre abrupto) se confirma con psutil
+        if not self._has_profile_lock(directory_path):
+            return False
+
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            for proc in psutil.process_iter(['pid', 'name']):
                 try:
                     if proc.info['name'] and 'chrome' in proc.info['name'].lower():
-                        cmdline = proc.info.get('cmdline', [])
+                        # La línea de comandos solo se lee para procesos de Chrome
+                        cmdline = proc.cmdline()
                         if cmdline:
                             cmdline_str = ' '.join(cmdline)
                             if directory_path in cmdline_str:
@@ -101,6 +177,25 @@ class ChromeUserDataManager:
         except Exception:
             return True  # En caso de duda, asumir que está en uso
 
+    def _has_profile_lock(self, directory_path: str) -> bool:
+        """
+        Verifica si el directorio contiene un archivo de bloqueo de perfil de Chrome
+
+        Args:
+            directory_path: Ruta del directorio
+
+        Returns:
+            True si existe algún archivo de bloqueo
+        """
+        try:
+            # lexists: SingletonLock es un enlace simbólico que apunta a host-pid
+            return any(
+                os.path.lexists(os.path.join(directory_path, lock_file))
+                for lock_file in self.PROFILE_LOCK_FILES
+            )
+        except Exception:
+            return True  # En caso de duda, verificar con los procesos
+
     def _try_cleanup_directory(self, directory_path: str) -> bool:
         """
         Intenta limpiar un directorio de datos de usuario
@@ -112,6 +207,10 @@ class ChromeUserDataManager:
             True si se limpió correctamente
         """
         try:
+            # Reservado por otro gestor: ni se usa ni se borra (aunque aún no exista)
+            if self._is_claimed_by_other(directory_path):
+                return False
+
             if not os.path.exists(directory_path):
                 return True
 
@@ -140,8 +239,8 @@ class ChromeUserDataManager:
             timestamp = str(int(time.time()))
             unique_dir = f"{self.base_user_data_dir}_{timestamp}"
 
-            # Si por alguna razón ya existe, usar tempfile
-            if os.path.exists(unique_dir):
+            # Si por alguna razón ya existe o está reservado, usar tempfile
+            if os.path.exists(unique_dir) or unique_dir in self._claimed_directories:
                 unique_dir = tempfile.mkdtemp(prefix="chrome_user_data_")
 
             return unique_dir
@@ -160,13 +259,21 @@ class ChromeUserDataManager:
         if not self.current_user_data_dir:
             return
 
-        try:
-            if force or not self._is_chrome_using_directory(self.current_user_data_dir):
-                if os.path.exists(self.current_user_data_dir):
-                    shutil.rmtree(self.current_user_data_dir, ignore_errors=True)
+        # Con el lock tomado ningún gestor puede elegir este directorio mientras se borra
+        with self._directory_lock:
+            self._release_claim()
 
-        except Exception:
-            pass
+            try:
+                # Nunca borrar un directorio que otro gestor acaba de reservar
+                if self._is_claimed_by_other(self.current_user_data_dir):
+                    return
+
+                if force or not self._is_chrome_using_directory(self.current_user_data_dir):
+                    if os.path.exists(self.current_user_data_dir):
+                        shutil.rmtree(self.current_user_data_dir, ignore_errors=True)
+
+            except Exception:
+                pass
 
 
 class ChromeDriverManager:
@@ -174,6 +281,52 @@ class ChromeDriverManager:
     Gestor especializado para el navegador Chrome optimizado para WhatsApp Web
     """
 
+    # Argumentos de Chrome que no dependen de la instancia (el directorio de datos se agrega aparte)
+    CHROME_ARGUMENTS = (
+        # Anti-detección
+        "--disable-blink-features=AutomationControlled",
+        # Optimizaciones de rendimiento
+        "--disable-extensions",
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--disable-gpu",
+        "--disable-web-security",
+        "--allow-running-insecure-content",
+        # Chrome solo respeta el último --disable-features: todas las funciones en una lista
+        "--disable-features=VizDisplayCompositor,Translate,MediaRouter,"
+        "OptimizationHints,PasswordManagerOnboarding,InterestFeedContentSuggestions",
+        "--disable-ipc-flooding-protection",
+        "--disable-renderer-backgrounding",
+        "--disable-backgrounding-occluded-windows",
+        "--disable-background-networking",
+        "--disable-background-timer-throttling",
+        "--disable-sync",
+        "--disable-default-apps",
+        "--disable-hang-monitor",
+        "--metrics-recording-only",
+        # Ventana maximizada desde el arranque (evita un maximize_window posterior)
+        "--start-maximized",
+        # Configuración de idioma para soporte Unicode
+        "--lang=es",
+        "--accept-lang=es-ES,es,en",
+    )
+
+    # Preferencias de Chrome (constantes, compartidas por todas las instancias)
+    CHROME_PREFS = {
+        "profile.default_content_setting_values": {
+            "media_stream": 1,
+            "media_stream_camera": 1,
+            "media_stream_mic": 1,
+            "notifications": 1
+        },
+        "profile.default_content_settings.popups": 0,
+        "profile.managed_default_content_settings.images": 1,
+        "intl.accept_languages": "es-ES,es,en",
+        "intl.charset_default": "UTF-8",
+        "profile.default_content_setting_values.automatic_downloads": 1,
+        "profile.content_settings.exceptions.automatic_downloads.*.setting": 1
+    }
+
     def __init__(self, status_callback: Optional[Callable] = None):
         """
         Inicializa el gestor del driver Chrome
@@ -183,11 +336,30 @@ class ChromeDriverManager:
         """
         self.driver = None
         self.status_callback = status_callback
-        self._chrome_options = None
+        # Opciones de Chrome ya construidas por directorio de datos (reutilizadas en reintentos)
+        self._chrome_options: Dict[str, Options] = {}
         self.user_data_manager = ChromeUserDataManager()
         self._initialization_attempts = 0
         self._max_initialization_attempts = 3
 
+        # Hilo del cierre en segundo plano (close(wait=False)), si hay uno en curso
+        self._close_thread: Optional[threading.Thread] = None
+
+        # Momento (time.monotonic) de la última verificación exitosa de la sesión
+        self._last_alive_check = 0.0
+
+        # Cache de elementos frecuentes (message_box, search_box...) por conversación
+        self._element_cache: Dict[str, Any] = {}
+
+        # Localizadores ya combinados por lista de selectores (no dependen de la página)
+        self._locator_cache: Dict[tuple, tuple] = {}
+
+        # WebDriverWait reutilizables por timeout: timeout -> (driver, wait)
+        self._element_waits: Dict[float, tuple] = {}
+
+        # Último selector que encontró el elemento, por lista de selectores
+        self._winning_locators: Dict[tuple, tuple] = {}
+
     def _update_status(self, message: str):
         """
         Actualiza el estado y notifica mediante callback
@@ -195,9 +367,11 @@ class ChromeDriverManager:
         Args:
             message: Mensaje de estado
         """
-        print(f"[Driver] {message}")
+        # Con callback la GUI ya muestra el mensaje; stdout solo se usa sin GUI
         if self.status_callback:
             self.status_callback(message)
+        else:
+            print(f"[Driver] {message}")
 
     def _configure_chrome_options(self, user_data_dir: str) -> Options:
         """
@@ -211,52 +385,23 @@ class ChromeDriverManager:
         """
         options = Options()
 
+        # Argumentos fijos (anti-detección, rendimiento, ventana e idioma)
+        for argument in self.CHROME_ARGUMENTS:
+            options.add_argument(argument)
+
         # Configuración básica anti-detección
-        options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
 
-        # Optimizaciones de rendimiento
-        options.add_argument("--disable-extensions")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--disable-web-security")
-        options.add_argument("--allow-running-insecure-content")
-        options.add_argument("--disable-features=VizDisplayCompositor")
-        options.add_argument("--disable-ipc-flooding-protection")
-        options.add_argument("--disable-renderer-backgrounding")
-        options.add_argument("--disable-backgrounding-occluded-windows")
-        options.add_argument("--disable-background-networking")
-
-        # Configuración de idioma para soporte Unicode
-        options.add_argument("--lang=es")
-        options.add_argument("--accept-lang=es-ES,es,en")
-
         # MEJORADO: Directorio de datos de usuario dinámico
         options.add_argument(f"--user-data-dir={user_data_dir}")
 
-        # NUEVO: Argumentos adicionales para manejar múltiples instancias
-        options.add_argument("--disable-background-timer-throttling")
-        options.add_argument("--disable-backgrounding-occluded-windows")
-        options.add_argument("--disable-renderer-backgrounding")
-
         # Configuración de preferencias avanzadas
-        prefs = {
-            "profile.default_content_setting_values": {
-                "media_stream": 1,
-                "media_stream_camera": 1,
-                "media_stream_mic": 1,
-                "notifications": 1
-            },
-            "profile.default_content_settings.popups": 0,
-            "profile.managed_default_content_settings.images": 1,
-            "intl.accept_languages": "es-ES,es,en",
-            "intl.charset_default": "UTF-8",
-            "profile.default_content_setting_values.automatic_downloads": 1,
-            "profile.content_settings.exceptions.automatic_downloads.*.setting": 1
-        }
-        options.add_experimental_option("prefs", prefs)
+        options.add_experimental_option("prefs", self.CHROME_PREFS)
+
+        # WhatsApp Web nunca termina de cargar recursos: devolver el control con el DOM listo,
+        # la disponibilidad real se confirma esperando los selectores principales
+        options.page_load_strategy = 'eager'
 
         return options
 
@@ -272,22 +417,29 @@ class ChromeDriverManager:
         """
         try:
             # Configurar opciones con el directorio específico
-            options = self._configure_chrome_options(user_data_dir)
+            options = self._chrome_options.get(user_data_dir)
+            if options is None:
+                options = self._configure_chrome_options(user_data_dir)
+                self._chrome_options[user_data_dir] = options
 
             self._update_status(f"Intentando inicializar Chrome con: {os.path.basename(user_data_dir)}")
 
             # Crear driver
             self.driver = webdriver.Chrome(options=options)
 
-            # Script anti-detección
-            self.driver.execute_script(
-                "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-            )
+            # Script anti-detección: registrado por CDP para que se aplique en cada documento
+            # antes de que corra el JavaScript de la página (la ventana ya se abre maximizada)
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+            })
 
-            # Configuración de ventana y timeouts
-            self.driver.maximize_window()
-            self.driver.implicitly_wait(3)
+            # Configuración de timeouts: sin espera implícita, las esperas explícitas controlan
+            # el sondeo y un find_elements sin resultados responde de inmediato
+            self.driver.implicitly_wait(0)
             self.driver.set_page_load_timeout(WhatsAppConstants.PAGE_LOAD_TIMEOUT)
+            self.driver.set_script_timeout(WhatsAppConstants.SCRIPT_TIMEOUT)
+
+            self._block_unneeded_requests()
 
             return True
 
@@ -303,6 +455,23 @@ class ChromeDriverManager:
             self._update_status(f"Error inesperado: {str(e)}")
             return False
 
+    def _block_unneeded_requests(self):
+        """
+        Bloquea por CDP las descargas que el bot no necesita (p. ej. fotos de perfil)
+
+        No es crítico: si Chrome no admite el comando, la sesión sigue igual.
+        """
+        if not WhatsAppConstants.BLOCKED_URL_PATTERNS:
+            return
+
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {
+                "urls": list(WhatsAppConstants.BLOCKED_URL_PATTERNS)
+            })
+        except Exception as e:
+            self._update_status(f"⚠️ No se pudieron bloquear recursos innecesarios: {str(e)}")
+
     def initialize_driver(self) -> bool:
         """
         Inicializa el driver de Chrome con manejo inteligente de directorios
@@ -331,38 +500,69 @@ class ChromeDriverManager:
             # Si falló, intentar con directorio alternativo
             self._update_status("⚠️ Reintentando con directorio alternativo...")
 
-            # Obtener nuevo directorio (forzará uno único)
-            alternative_dir = self.user_data_manager._create_unique_directory()
+            # Obtener nuevo directorio único, reservado igual que el anterior
+            alternative_dir = self.user_data_manager.claim_unique_directory()
 
             if self._attempt_driver_initialization(alternative_dir):
                 self._update_status("✅ Navegador iniciado con directorio alternativo")
                 self._initialization_attempts = 0
                 return True
 
-            # Si ambos fallan, reportar error
+            # Si ambos fallan, reportar error (y liberar la reserva: el gestor puede descartarse)
             self._update_status("❌ No se pudo inicializar el navegador")
+            self.user_data_manager.release_current_directory()
             return False
 
         except Exception as e:
             self._update_status(f"❌ Error al inicializar navegador: {str(e)}")
+            self.user_data_manager.release_current_directory()
             return False
 
-    def is_session_alive(self) -> bool:
+    def is_session_alive(self, max_age: float = 0.0) -> bool:
         """
         Verifica si la sesión del navegador sigue activa
 
+        Hace un round-trip al navegador: las operaciones internas solo comprueban que
+        exista el driver y dejan que un fallo real se detecte por la excepción.
+
+        Args:
+            max_age: Segundos durante los que se reutiliza la última verificación exitosa
+                     (0 fuerza el round-trip)
+
         Returns:
             True si la sesión está activa
         """
         try:
             if not self.driver:
                 return False
+
+            if max_age and time.monotonic() - self._last_alive_check < max_age:
+                return True
+
             # Intenta acceder al título para verificar que el driver responde
             _ = self.driver.title
+            self._last_alive_check = time.monotonic()
             return True
         except Exception:
+            self._last_alive_check = 0.0
             return False
 
+    @staticmethod
+    def backoff_delay(attempt: int, base: float = WhatsAppConstants.SHORT_DELAY,
+                      cap: float = WhatsAppConstants.LONG_DELAY) -> float:
+        """
+        Calcula la espera antes de reintentar con backoff exponencial y jitter
+
+        Args:
+            attempt: Número de intento fallido (desde 0)
+            base: Espera del primer reintento
+            cap: Espera máxima sin contar el jitter
+
+        Returns:
+            Segundos a esperar
+        """
+        return min(cap, base * (2 ** attempt)) + random.uniform(0, base)
+
     def navigate_to(self, url: str) -> bool:
         """
         Navega a una URL específica
@@ -379,6 +579,7 @@ class ChromeDriverManager:
                 return False
 
             self._update_status(f"Navegando a: {url}")
+            self.invalidate_element_cache()
             self.driver.get(url)
             return True
 
@@ -386,24 +587,80 @@ class ChromeDriverManager:
             self._update_status(f"Error al navegar a {url}: {str(e)}")
             return False
 
-    def execute_script(self, script: str):
+    def execute_script(self, script: str, *args):
         """
         Ejecuta un script JavaScript en el navegador
 
         Args:
             script: Código JavaScript a ejecutar
+            *args: Argumentos disponibles en el script como arguments[0], arguments[1]...
 
         Returns:
             Resultado de la ejecución del script
         """
         try:
-            if not self.is_session_alive():
+            if not self.driver:
                 return None
-            return self.driver.execute_script(script)
+            return self.driver.execute_script(script, *args)
         except Exception as e:
             self._update_status(f"Error ejecutando script: {str(e)}")
             return None
 
+    def execute_async_script(self, script: str, *args):
+        """
+        Ejecuta un script JavaScript asíncrono que responde mediante el callback de Selenium
+
+        Args:
+            script: Código JavaScript a ejecutar (el callback es el último argumento)
+            *args: Argumentos disponibles en el script como arguments[0], arguments[1]...
+
+        Returns:
+            Valor pasado al callback o None si hubo error o timeout
+        """
+        try:
+            if not self.driver:
+                return None
+            return self.driver.execute_async_script(script, *args)
+        except Exception as e:
+            self._update_status(f"Error ejecutando script asíncrono: {str(e)}")
+            return None
+
+    def insert_text(self, text: str) -> bool:
+        """
+        Inserta texto en el elemento con foco mediante CDP (Input.insertText)
+
+        Cada línea se inserta en una sola llamada y los saltos de línea se envían como
+        Shift+Enter, en lugar de un comando de teclado de WebDriver por carácter.
+        Chrome inserta el texto tal cual, incluidos los caracteres fuera del BMP.
+
+        Args:
+            text: Texto a insertar
+
+        Returns:
+            True si se insertó correctamente
+        """
+        try:
+            if not self.driver:
+                return False
+
+            lines = text.split('\n')
+            for i, line in enumerate(lines):
+                if line:
+                    self.driver.execute_cdp_cmd("Input.insertText", {"text": line})
+                if i < len(lines) - 1:
+                    for event_type in ("rawKeyDown", "keyUp"):
+                        self.driver.execute_cdp_cmd("Input.dispatchKeyEvent", {
+                            "type": event_type,
+                            "key": "Enter",
+                            "code": "Enter",
+                            "windowsVirtualKeyCode": 13,
+                            "modifiers": 8  # Shift
+                        })
+            return True
+        except Exception as e:
+            self._update_status(f"Error insertando texto por CDP: {str(e)}")
+            return False
+
     def wait_for_element(self, selectors: list, timeout: int = None, clickable: bool = False):
         """
         Espera a que aparezca un elemento usando múltiples selectores
@@ -416,36 +673,207 @@ class ChromeDriverManager:
         Returns:
             Elemento encontrado o None
         """
-        if not self.is_session_alive():
+        if not self.driver:
             return None
 
         if timeout is None:
             timeout = WhatsAppConstants.ELEMENT_WAIT_TIMEOUT
 
-        # Usar timeout más corto para cada selector individual
-        individual_timeout = max(1, timeout // len(selectors))
+        # Una sola espera para todas las alternativas: la unión CSS (",") y XPath ("|")
+        # detecta en una consulta por sondeo si alguna está presente
+        union_locators, priority_locators = self._get_compiled_locators(selectors)
+        cache_key = tuple(selectors)
+
+        # Solo CSS: esperar dentro del navegador con un MutationObserver (una sola llamada)
+        if timeout < WhatsAppConstants.SCRIPT_TIMEOUT and all(
+                by == By.CSS_SELECTOR for by, _ in priority_locators):
+            try:
+                return self.driver.execute_async_script(
+                    JavaScriptInjector.WAIT_FOR_ELEMENT_SCRIPT,
+                    list(selectors), int(timeout * 1000), clickable
+                )
+            except WebDriverException:
+                pass  # Si el script falla, usar la espera por sondeo
+
+        def find_in(driver, locator):
+            try:
+                elements = driver.find_elements(*locator)
+            except InvalidSelectorException:
+                return None
+
+            for element in elements:
+                if not clickable or (element.is_displayed() and element.is_enabled()):
+                    return element
+            return None
+
+        def find_first_match(driver):
+            # El selector que funcionó la última vez suele seguir funcionando: probarlo primero
+            winning_locator = self._winning_locators.get(cache_key)
+            if winning_locator:
+                element = find_in(driver, winning_locator)
+                if element:
+                    return element
 
-        for selector in selectors:
             try:
-                wait = WebDriverWait(self.driver, individual_timeout)
+                if not any(driver.find_elements(*locator) for locator in union_locators):
+                    return False
+            except InvalidSelectorException:
+                pass  # Algún selector inválido rompe la unión: resolver uno por uno
 
-                # Determinar si es XPath o CSS
-                if selector.startswith('//') or selector.startswith('('):
-                    by_method = By.XPATH
-                else:
-                    by_method = By.CSS_SELECTOR
+            # Hay coincidencia: respetar el orden de prioridad de la lista
+            for locator in priority_locators:
+                if locator == winning_locator:
+                    continue
+                element = find_in(driver, locator)
+                if element:
+                    self._winning_locators[cache_key] = locator
+                    return element
+
+            return False
 
-                if clickable:
-                    element = wait.until(EC.element_to_be_clickable((by_method, selector)))
-                else:
-                    element = wait.until(EC.presence_of_element_located((by_method, selector)))
+        try:
+            return self._get_element_wait(timeout).until(find_first_match)
+        except TimeoutException:
+            return None
 
-                return element
+    def _get_element_wait(self, timeout: float) -> WebDriverWait:
+        """
+        Obtiene (reutilizando) el WebDriverWait de wait_for_element para un timeout
 
-            except TimeoutException:
-                continue
+        Args:
+            timeout: Tiempo máximo de espera
 
-        return None
+        Returns:
+            WebDriverWait asociado al driver actual
+        """
+        cached = self._element_waits.get(timeout)
+        if cached is None or cached[0] is not self.driver:
+            wait = WebDriverWait(
+                self.driver,
+                timeout,
+                poll_frequency=WhatsAppConstants.ELEMENT_POLL_FREQUENCY,
+                ignored_exceptions=(StaleElementReferenceException,)
+            )
+            cached = (self.driver, wait)
+            self._element_waits[timeout] = cached
+        return cached[1]
+
+    @staticmethod
+    def _get_by_method(selector: str) -> str:
+        """
+        Determina si un selector es XPath o CSS
+
+        Args:
+            selector: Selector CSS/XPath
+
+        Returns:
+            Estrategia By correspondiente
+        """
+        if selector.startswith(('/', '(')):
+            return By.XPATH
+        return By.CSS_SELECTOR
+
+    def _build_union_locators(self, selectors: list) -> list:
+        """
+        Combina una lista de selectores en un localizador CSS y otro XPath
+
+        Args:
+            selectors: Lista de selectores CSS/XPath
+
+        Returns:
+            Lista de tuplas (By, selector_combinado)
+        """
+        css_selectors = [sel for sel in selectors if self._get_by_method(sel) == By.CSS_SELECTOR]
+        xpath_selectors = [sel for sel in selectors if self._get_by_method(sel) == By.XPATH]
+
+        union_locators = []
+        if css_selectors:
+            union_locators.append((By.CSS_SELECTOR, ', '.join(css_selectors)))
+        if xpath_selectors:
+            union_locators.append((By.XPATH, ' | '.join(xpath_selectors)))
+        return union_locators
+
+    def _get_compiled_locators(self, selectors: list) -> tuple:
+        """
+        Obtiene (con cache) los localizadores de unión y los individuales por prioridad
+
+        Args:
+            selectors: Lista de selectores CSS/XPath
+
+        Returns:
+            Tupla (localizadores_union, localizadores_por_prioridad)
+        """
+        cache_key = tuple(selectors)
+        compiled = self._locator_cache.get(cache_key)
+        if compiled is None:
+            compiled = (
+                self._build_union_locators(selectors),
+                [(self._get_by_method(selector), selector) for selector in selectors]
+            )
+            self._locator_cache[cache_key] = compiled
+        return compiled
+
+    def get_cached_element(self, selector_key: str, timeout: int = None, clickable: bool = False):
+        """
+        Obtiene un elemento frecuente reutilizando el handle ya localizado si sigue visible
+
+        Args:
+            selector_key: Clave del selector (ej: 'message_box', 'search_box')
+            timeout: Tiempo máximo de espera si hay que volver a buscarlo
+            clickable: Si el elemento debe ser clickeable
+
+        Returns:
+            Elemento encontrado o None
+        """
+        element = self._element_cache.get(selector_key)
+        if element is not None:
+            try:
+                if element.is_displayed() and (not clickable or element.is_enabled()):
+                    return element
+            except (StaleElementReferenceException, WebDriverException):
+                pass
+            self._element_cache.pop(selector_key, None)
+
+        element = self.wait_for_element(WhatsAppConstants.get_selectors(selector_key), timeout, clickable)
+        if element is not None:
+            self._element_cache[selector_key] = element
+        return element
+
+    def invalidate_element_cache(self, selector_key: Optional[str] = None):
+        """
+        Descarta handles cacheados (todos o solo uno)
+
+        Args:
+            selector_key: Clave a descartar (None para limpiar todo el cache)
+        """
+        if selector_key is None:
+            self._element_cache.clear()
+        else:
+            self._element_cache.pop(selector_key, None)
+
+    def wait_until(self, condition: Callable, timeout: float = None, poll_frequency: float = 0.2) -> bool:
+        """
+        Espera hasta que se cumpla una condición en el navegador en lugar de dormir un tiempo fijo
+
+        Args:
+            condition: Función que recibe el driver y devuelve un valor verdadero al cumplirse
+            timeout: Tiempo máximo de espera (usa default si None)
+            poll_frequency: Intervalo entre comprobaciones
+
+        Returns:
+            True si la condición se cumplió antes del timeout
+        """
+        if not self.driver:
+            return False
+
+        if timeout is None:
+            timeout = WhatsAppConstants.ELEMENT_WAIT_TIMEOUT
+
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency).until(condition)
+            return True
+        except (TimeoutException, WebDriverException):
+            return False
 
     def safe_click(self, element, max_attempts: int = 2) -> bool:
         """
@@ -458,30 +886,27 @@ class ChromeDriverManager:
         Returns:
             True si el click fue exitoso
         """
-        if not self.is_session_alive():
+        if not self.driver:
             return False
 
         for attempt in range(max_attempts):
             try:
-                # Scroll al elemento
-                self.driver.execute_script(
-                    "arguments[0].scrollIntoView({block: 'center', behavior: 'instant'});",
-                    element
-                )
-                time.sleep(WhatsAppConstants.SHORT_DELAY)
-
-                # Click directo
+                # Click directo (ChromeDriver hace scroll al elemento automáticamente)
                 element.click()
                 return True
 
             except Exception:
                 try:
-                    # Click con JavaScript como fallback
-                    self.driver.execute_script("arguments[0].click();", element)
+                    # Fallback: scroll y click con JavaScript en una sola llamada
+                    self.driver.execute_script(
+                        "arguments[0].scrollIntoView({block: 'center', behavior: 'instant'});"
+                        "arguments[0].click();",
+                        element
+                    )
                     return True
                 except Exception:
                     if attempt < max_attempts - 1:
-                        time.sleep(WhatsAppConstants.SHORT_DELAY)
+                        time.sleep(self.backoff_delay(attempt))
                         continue
                     return False
 
@@ -496,28 +921,75 @@ class ChromeDriverManager:
         """
         return self.driver
 
-    def close(self, cleanup_user_data: bool = True):
+    def close(self, cleanup_user_data: bool = True, wait: bool = True):
         """
         Cierra el navegador y limpia recursos
 
         Args:
             cleanup_user_data: Si debe limpiar el directorio de datos de usuario
+            wait: Si False, el cierre (driver.quit puede tardar varios segundos) se hace en
+                  un hilo aparte y el llamador continúa de inmediato. Solo debe usarse cuando
+                  esta instancia no se vuelve a inicializar.
+        """
+        driver = self.driver
+        self.driver = None
+        self.invalidate_element_cache()
+
+        if wait:
+            self._quit_driver(driver, cleanup_user_data)
+        else:
+            # Hilo no daemon: el proceso no termina dejando Chrome abierto. Se conserva para que
+            # el próximo gestor espere (wait_until_closed) antes de elegir directorio
+            self._close_thread = threading.Thread(
+                target=self._quit_driver,
+                args=(driver, cleanup_user_data),
+                name="ChromeDriverQuit"
+            )
+            self._close_thread.start()
+
+    def wait_until_closed(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que termine un cierre en segundo plano (quit y limpieza del directorio)
+
+        Args:
+            timeout: Tiempo máximo de espera (None espera sin límite)
+
+        Returns:
+            True si no queda ningún cierre en curso
+        """
+        close_thread = self._close_thread
+        if close_thread is None:
+            return True
+
+        close_thread.join(timeout)
+        if close_thread.is_alive():
+            return False
+
+        self._close_thread = None
+        return True
+
+    def _quit_driver(self, driver, cleanup_user_data: bool):
+        """
+        Cierra una instancia del WebDriver y, opcionalmente, su directorio de datos
+
+        Args:
+            driver: Instancia del WebDriver a cerrar (puede ser None)
+            cleanup_user_data: Si debe limpiar el directorio de datos de usuario
         """
         try:
-            if self.driver:
+            if driver:
                 self._update_status("🔒 Cerrando navegador...")
-                self.driver.quit()
-                self.driver = None
+                driver.quit()
                 self._update_status("✅ Navegador cerrado correctamente")
 
-            # Limpiar directorio de datos de usuario si se solicita
-            if cleanup_user_data:
-                self.user_data_manager.cleanup_current_directory()
-
         except Exception as e:
             self._update_status(f"⚠️ Error al cerrar navegador: {str(e)}")
-        finally:
-            self.driver = None
+
+        # Limpiar directorio de datos de usuario si se solicita; si no, solo liberar la reserva
+        if cleanup_user_data:
+            self.user_data_manager.cleanup_current_directory()
+        else:
+            self.user_data_manager.release_current_directory()
 
     def force_cleanup(self):
         """
@@ -530,6 +1002,7 @@ class ChromeDriverManager:
             pass
         finally:
             self.driver = None
+            self.invalidate_element_cache()
 
         # Forzar limpieza del directorio
         self.user_data_manager.cleanup_current_directory(force=True)
@@ -542,7 +1015,7 @@ class ChromeDriverManager:
             URL actual o None si hay error
         """
         try:
-            if self.is_session_alive():
+            if self.driver:
                 return self.driver.current_url
         except Exception:
             pass
@@ -556,7 +1029,7 @@ class ChromeDriverManager:
             Título de la página o None si hay error
         """
         try:
-            if self.is_session_alive():
+            if self.driver:
                 return self.driver.title
         except Exception:
             pass
@@ -12,10 +12,14 @@ import time
 import re
 from typing import Optional, Callable, Dict, Any
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import WebDriverException
 from whatsapp_utils import (WhatsAppConstants, UnicodeHandler, JavaScriptInjector,
                             FileValidator, get_absolute_image_path)
 from whatsapp_driver import ChromeDriverManager
 
+# Patrón compartido para detectar placeholders como [nombre], [numero], etc.
+_PLACEHOLDER_RE = re.compile(r'\[(\w+)\]', re.IGNORECASE)
+
 
 class MessagePersonalizer:
     """
@@ -27,7 +31,7 @@ class MessagePersonalizer:
         Inicializa el personalizador de mensajes
         """
         # Patrón para detectar placeholders como [nombre], [numero], etc.
-        self.placeholder_pattern = re.compile(r'\[(\w+)\]', re.IGNORECASE)
+        self.placeholder_pattern = _PLACEHOLDER_RE
 
     def has_placeholders(self, text: str) -> bool:
         """
@@ -43,6 +47,67 @@ class MessagePersonalizer:
             return False
         return bool(self.placeholder_pattern.search(text))
 
+    @staticmethod
+    def mark_message(message_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Crea una copia del mensaje con la detección de placeholders precalculada
+
+        Args:
+            message_data: Diccionario del mensaje con 'texto'
+
+        Returns:
+            Copia del mensaje con las claves '_needs_personalization' y '_template_parts'
+        """
+        marked = dict(message_data)
+        marked['_needs_personalization'] = bool(_PLACEHOLDER_RE.search(message_data.get('texto') or ''))
+        marked['_template_parts'] = MessagePersonalizer.split_template((message_data.get('texto') or '').strip())
+        return marked
+
+    @staticmethod
+    def split_template(text: str) -> tuple:
+        """
+        Divide un texto en partes literales y nombres de placeholder alternados
+
+        Args:
+            text: Texto con placeholders
+
+        Returns:
+            Tupla (literal, placeholder, literal, ...): los índices impares son placeholders
+        """
+        return tuple(_PLACEHOLDER_RE.split(text or ''))
+
+    @staticmethod
+    def get_template_parts(message_data: Dict[str, Any]) -> tuple:
+        """
+        Obtiene las partes del texto de un mensaje usando el valor precalculado si existe
+
+        Args:
+            message_data: Diccionario del mensaje
+
+        Returns:
+            Tupla de partes como la de split_template
+        """
+        cached = message_data.get('_template_parts')
+        if cached is not None:
+            return cached
+        return MessagePersonalizer.split_template((message_data.get('texto') or '').strip())
+
+    @staticmethod
+    def needs_personalization(message_data: Dict[str, Any]) -> bool:
+        """
+        Indica si un mensaje requiere personalización usando el valor precalculado si existe
+
+        Args:
+            message_data: Diccionario del mensaje
+
+        Returns:
+            True si el texto del mensaje contiene placeholders
+        """
+        cached = message_data.get('_needs_personalization')
+        if cached is not None:
+            return cached
+        return bool(_PLACEHOLDER_RE.search(message_data.get('texto') or ''))
+
     def personalize_message(self, text: str, contact_data: Dict[str, str]) -> str:
         """
         Personaliza un mensaje reemplazando placeholders con datos del contacto
@@ -57,24 +122,45 @@ class MessagePersonalizer:
         if not text or not self.has_placeholders(text):
             return text
 
-        try:
-            personalized_text = text
+        return self.render_template(self.split_template(text), contact_data, fallback=text)
 
-            # Reemplazar [nombre] con el nombre del contacto
-            if '[nombre]' in personalized_text.lower():
-                nombre = contact_data.get('nombre', 'Usuario')
-                personalized_text = re.sub(r'\[nombre\]', nombre, personalized_text, flags=re.IGNORECASE)
+    def render_template(self, template_parts: tuple, contact_data: Dict[str, str],
+                        fallback: str = None) -> str:
+        """
+        Compone el texto personalizado a partir de partes ya divididas (split_template)
 
-            # Reemplazar [numero] con el número del contacto (por si se quiere usar en el futuro)
-            if '[numero]' in personalized_text.lower():
-                numero = contact_data.get('numero', '')
-                personalized_text = re.sub(r'\[numero\]', numero, personalized_text, flags=re.IGNORECASE)
+        Args:
+            template_parts: Partes literales y placeholders alternados
+            contact_data: Diccionario con datos del contacto {'nombre': str, 'numero': str}
+            fallback: Texto a devolver si hay error (por defecto, la plantilla sin reemplazar)
+
+        Returns:
+            Texto personalizado
+        """
+        try:
+            pieces = []
+            for index, part in enumerate(template_parts):
+                if index % 2 == 0:
+                    pieces.append(part)
+                    continue
+
+                # Solo [nombre] y [numero] se reemplazan; otros placeholders quedan como están
+                placeholder = part.lower()
+                if placeholder == 'nombre':
+                    pieces.append(contact_data.get('nombre', 'Usuario'))
+                elif placeholder == 'numero':
+                    pieces.append(contact_data.get('numero', ''))
+                else:
+                    pieces.append(f"[{part}]")
 
-            return personalized_text
+            return ''.join(pieces)
 
         except Exception as e:
             print(f"[Personalizer] Error personalizando mensaje: {e}")
-            return text  # Devolver texto original en caso de error
+            if fallback is not None:
+                return fallback  # Devolver texto original en caso de error
+            return ''.join(part if index % 2 == 0 else f"[{part}]"
+                           for index, part in enumerate(template_parts))
 
     def get_available_placeholders(self) -> list:
         """
@@ -104,6 +190,10 @@ class MessageSender:
         self.file_validator = FileValidator()
         self.personalizer = MessagePersonalizer()  # NUEVO: Personalizador de mensajes
 
+        # Cache de rutas resueltas: nombre de archivo -> ruta absoluta (la validez no se cachea
+        # aquí, la decide FileValidator con su cache por mtime/tamaño)
+        self._image_path_cache: Dict[str, str] = {}
+
     def _update_status(self, message: str):
         """
         Actualiza el estado y notifica mediante callback
@@ -111,9 +201,11 @@ class MessageSender:
         Args:
             message: Mensaje de estado
         """
-        print(f"[Messaging] {message}")
+        # Con callback la GUI ya muestra el mensaje; stdout solo se usa sin GUI
         if self.status_callback:
             self.status_callback(message)
+        else:
+            print(f"[Messaging] {message}")
 
     def _get_message_box(self):
         """
@@ -122,8 +214,8 @@ class MessageSender:
         Returns:
             Elemento del campo de mensaje o None
         """
-        return self.driver_manager.wait_for_element(
-            WhatsAppConstants.SELECTORS['message_box'],
+        return self.driver_manager.get_cached_element(
+            'message_box',
             timeout=WhatsAppConstants.ELEMENT_WAIT_TIMEOUT,
             clickable=True
         )
@@ -139,24 +231,58 @@ class MessageSender:
             True si el mensaje parece haber sido enviado
         """
         try:
-            message_box = self._get_message_box()
-            if not message_box:
+            if not self.driver_manager.driver:
                 return False
+            return self._is_message_box_cleared(self.driver_manager.driver, original_text)
 
-            # Obtener texto actual del campo
-            current_text = message_box.get_attribute('textContent') or message_box.text or ''
-            current_text = current_text.strip()
+        except Exception as e:
+            self._update_status(f"Error verificando envío: {str(e)}")
+            return False
 
-            # Si el campo está vacío o no contiene el texto original, probablemente se envió
-            if not current_text or current_text != original_text.strip():
-                return True
+    def _is_message_box_cleared(self, driver, original_text: str) -> bool:
+        """
+        Comprueba si el campo de mensaje ya no contiene el texto original
 
-            return False
+        Args:
+            driver: Instancia del WebDriver
+            original_text: Texto original que se intentó enviar
 
-        except Exception as e:
-            self._update_status(f"Error verificando envío: {str(e)}")
+        Returns:
+            True si el campo está vacío o tiene otro texto
+        """
+        current_text = driver.execute_script(
+            JavaScriptInjector.FIRST_MATCH_TEXT_SCRIPT,
+            WhatsAppConstants.get_selectors('message_box')
+        )
+        if current_text is None:
             return False
 
+        # Texto actual del campo
+        current_text = current_text.strip()
+
+        # Si el campo está vacío o no contiene el texto original, probablemente se envió
+        return not current_text or current_text != original_text.strip()
+
+    def _wait_until_message_sent(self, original_text: str, timeout: float = 3) -> bool:
+        """
+        Sondea el campo de mensaje hasta confirmar el envío en lugar de esperar un tiempo fijo
+
+        Args:
+            original_text: Texto original que se intentó enviar
+            timeout: Tiempo máximo de espera
+
+        Returns:
+            True si el mensaje parece haber sido enviado
+        """
+        def message_sent(driver) -> bool:
+            # Sondeo silencioso: un error de JS cuenta como "todavía no" y no se reporta en cada intento
+            try:
+                return self._is_message_box_cleared(driver, original_text)
+            except WebDriverException:
+                return False
+
+        return self.driver_manager.wait_until(message_sent, timeout=timeout)
+
     def _send_text_with_javascript(self, message_text: str) -> bool:
         """
         MEJORADO: Envía texto usando JavaScript con manejo mejorado de Promises y verificación de envío
@@ -170,19 +296,16 @@ class MessageSender:
         try:
             self._update_status("📝 Enviando mensaje con soporte de emoticones...")
 
-            # Crear script JavaScript usando la utilidad mejorada
-            js_script = JavaScriptInjector.create_message_sender_script(message_text)
-
-            # MEJORA 1: Ejecutar script y manejar el resultado de manera asíncrona
-            result = self.driver_manager.execute_script(js_script)
+            # MEJORA 1: Ejecutar el script asíncrono; responde en cuanto se confirma el envío
+            result = self.driver_manager.execute_async_script(
+                JavaScriptInjector.MESSAGE_SENDER_SCRIPT,
+                *JavaScriptInjector.get_message_sender_args(message_text)
+            )
 
-            # MEJORA 2: Si el script retorna una Promise, esperarla
+            # MEJORA 2: Si el script falló o agotó el tiempo, sondear el estado real
             if result is None:
-                # El script puede estar ejecutándose asincrónicamente, esperar un poco
-                time.sleep(1.5)
-
-                # MEJORA 3: Verificar si el mensaje se envió comprobando el estado del campo
-                if self._check_if_message_was_sent(message_text):
+                # MEJORA 3: Sondear el campo de mensaje hasta confirmar el envío
+                if self._wait_until_message_sent(message_text):
                     self._update_status("✅ Mensaje con emoticones enviado correctamente")
                     return True
                 else:
@@ -196,8 +319,7 @@ class MessageSender:
 
             # MEJORA 5: Si result es False, verificar una vez más antes de fallar
             else:
-                time.sleep(1)
-                if self._check_if_message_was_sent(message_text):
+                if self._wait_until_message_sent(message_text):
                     self._update_status("✅ Mensaje con emoticones enviado (verificación secundaria)")
                     return True
                 else:
@@ -208,12 +330,13 @@ class MessageSender:
             self._update_status(f"❌ Error en envío JavaScript: {str(e)}")
             return False
 
-    def _send_text_fallback(self, message_text: str) -> bool:
+    def _send_text_fallback(self, message_text: str, has_emoji: bool = True) -> bool:
         """
         MEJORADO: Método de fallback con verificación previa para evitar doble envío
 
         Args:
             message_text: Texto del mensaje
+            has_emoji: Resultado ya calculado de has_emoji_or_unicode (evita re-escanear)
 
         Returns:
             True si se envió correctamente
@@ -235,21 +358,31 @@ class MessageSender:
                 return False
 
             message_box.clear()
-            time.sleep(WhatsAppConstants.SHORT_DELAY)
 
-            # Filtrar caracteres problemáticos para fallback
-            safe_text = UnicodeHandler.filter_bmp_characters(message_text)
-
-            # Enviar línea por línea para manejar saltos de línea
-            lines = safe_text.split('\n')
-            for i, line in enumerate(lines):
-                message_box.send_keys(line)
-                if i < len(lines) - 1:
-                    message_box.send_keys(Keys.SHIFT + Keys.ENTER)
-
-            time.sleep(0.5)
+            # Insertar el texto completo por CDP (una llamada por línea, con emoticones)
+            safe_text = message_text
+            if not self.driver_manager.insert_text(message_text):
+                message_box.clear()
+
+                # Filtrar caracteres problemáticos para send_keys (sin emoticones no hay
+                # caracteres fuera del BMP y el texto se usa tal cual)
+                if has_emoji:
+                    safe_text = UnicodeHandler.filter_bmp_characters(message_text)
+
+                # Un solo send_keys: los saltos de línea viajan como Shift+Enter en el mismo comando
+                # (Keys.NULL suelta Shift, que dentro de un mismo send_keys queda pulsado)
+                line_break = Keys.SHIFT + Keys.ENTER + Keys.NULL
+                message_box.send_keys(line_break.join(safe_text.split('\n')))
+
+            # Esperar a que WhatsApp habilite el botón de envío (como máximo 0.5s, como antes)
+            self.driver_manager.wait_for_element(
+                WhatsAppConstants.get_selectors('send_button'),
+                timeout=0.5
+            )
             message_box.send_keys(Keys.ENTER)
-            time.sleep(1.5)
+
+            # Esperar a que el campo se vacíe (mensaje enviado) en lugar de un tiempo fijo
+            self._wait_until_message_sent(safe_text)
 
             return True
 
@@ -273,7 +406,7 @@ class MessageSender:
                 self._update_status("❌ Mensaje de texto vacío")
                 return False
 
-            if not self.driver_manager.is_session_alive():
+            if not self.driver_manager.get_driver():
                 self._update_status("❌ Sesión no activa")
                 return False
 
@@ -294,8 +427,7 @@ class MessageSender:
                     return True
 
                 # MEJORA: Verificar una vez más antes de usar fallback
-                time.sleep(1)
-                if self._check_if_message_was_sent(final_message):
+                if self._wait_until_message_sent(final_message, timeout=1):
                     self._update_status("✅ Mensaje enviado (verificación final)")
                     return True
 
@@ -304,7 +436,7 @@ class MessageSender:
                 return self._send_text_fallback(final_message)
             else:
                 self._update_status("📝 Enviando texto simple...")
-                return self._send_text_fallback(final_message)
+                return self._send_text_fallback(final_message, has_emoji=False)
 
         except Exception as e:
             self._update_status(f"❌ Error al enviar mensaje de texto: {str(e)}")
@@ -318,7 +450,7 @@ class MessageSender:
             Elemento del botón adjuntar o None
         """
         return self.driver_manager.wait_for_element(
-            WhatsAppConstants.SELECTORS['attach_button'],
+            WhatsAppConstants.get_selectors('attach_button'),
             timeout=8,
             clickable=True
         )
@@ -331,7 +463,7 @@ class MessageSender:
             Elemento input de archivo o None
         """
         return self.driver_manager.wait_for_element(
-            WhatsAppConstants.SELECTORS['file_input'],
+            WhatsAppConstants.get_selectors('file_input'),
             timeout=5
         )
 
@@ -343,6 +475,13 @@ class MessageSender:
             True si se abrió correctamente
         """
         try:
+            # Si el input de archivo ya está en el DOM no hace falta abrir el menú adjuntar
+            if self.driver_manager.execute_script(
+                JavaScriptInjector.FIRST_MATCH_SCRIPT,
+                WhatsAppConstants.get_selectors('file_input')
+            ):
+                return True
+
             # Buscar botón adjuntar
             attach_button = self._get_attach_button()
             if not attach_button:
@@ -352,9 +491,7 @@ class MessageSender:
             if not self.driver_manager.safe_click(attach_button):
                 return False
 
-            time.sleep(WhatsAppConstants.MEDIUM_DELAY)
-
-            # Buscar input directo primero
+            # Buscar input directo primero (_get_file_input ya espera a que aparezca)
             file_input = self._get_file_input()
             if file_input:
                 return True
@@ -362,8 +499,9 @@ class MessageSender:
             # Si no hay input directo, buscar opción de fotos
             photos_option_selectors = [
                 "li[data-testid='mi-attach-image']",
-                "span:contains('Fotos y videos')",
-                "div[role='button'][title*='foto']"
+                "div[role='button'][title*='foto']",
+                # Coincidencia por texto: lo único que CSS no puede expresar
+                "//span[text()='Fotos y videos']"
             ]
 
             photos_option = self.driver_manager.wait_for_element(
@@ -373,7 +511,6 @@ class MessageSender:
             )
 
             if photos_option and self.driver_manager.safe_click(photos_option):
-                time.sleep(WhatsAppConstants.MEDIUM_DELAY)
                 return self._get_file_input() is not None
 
             return False
@@ -398,11 +535,18 @@ class MessageSender:
                 self._update_status("❌ No se encontró el input de archivo")
                 return False
 
-            absolute_path = os.path.abspath(image_path)
+            # image_path ya es absoluta (get_absolute_image_path)
             self._update_status(f"📎 Cargando imagen: {os.path.basename(image_path)}")
 
-            file_input.send_keys(absolute_path)
-            time.sleep(3)  # Tiempo para carga de imagen
+            file_input.send_keys(image_path)
+
+            # Esperar a que la vista previa muestre el botón de enviar en lugar de un tiempo fijo
+            preview_ready = self.driver_manager.wait_for_element(
+                WhatsAppConstants.get_selectors('send_button'),
+                timeout=10
+            )
+            if not preview_ready:
+                self._update_status("⚠️ Vista previa de la imagen no confirmada, continuando...")
 
             return True
 
@@ -430,10 +574,10 @@ class MessageSender:
                 final_caption = self.personalizer.personalize_message(caption_text, contact_data)
                 self._update_status(f"📝 Caption personalizado para {contact_data.get('nombre', 'contacto')}")
 
-            # Selectores para el área de caption (XPaths específicos + fallbacks)
+            # Selectores para el área de caption (rutas específicas + fallbacks)
             caption_selectors = [
-                "//*[@id='app']/div/div[3]/div/div[2]/div[2]/span/div/div/div/div[2]/div/div[1]/div[3]/div/div/div[2]/div[1]/div[1]/p",
-                "//*[@id='app']/div/div[3]/div/div[2]/div[2]/span/div/div/div/div[2]/div/div[1]/div[3]/div/div/div[2]",
+                "#app > div > div:nth-of-type(3) > div > div:nth-of-type(2) > div:nth-of-type(2) > span > div > div > div > div:nth-of-type(2) > div > div:nth-of-type(1) > div:nth-of-type(3) > div > div > div:nth-of-type(2) > div:nth-of-type(1) > div:nth-of-type(1) > p",
+                "#app > div > div:nth-of-type(3) > div > div:nth-of-type(2) > div:nth-of-type(2) > span > div > div > div > div:nth-of-type(2) > div > div:nth-of-type(1) > div:nth-of-type(3) > div > div > div:nth-of-type(2)",
                 "div[contenteditable='true'][data-tab='10']",
                 "div[role='textbox'][title*='mensaje']"
             ]
@@ -443,15 +587,13 @@ class MessageSender:
             if caption_box:
                 if not self.driver_manager.safe_click(caption_box):
                     self._update_status("⚠️ No se pudo hacer click en caption, continuando...")
-                else:
-                    time.sleep(0.5)
 
                 # Usar JavaScript para caption con emoticones
                 if UnicodeHandler.has_emoji_or_unicode(final_caption):
                     self._update_status("😀 Caption con emoticones detectado...")
-                    js_script = JavaScriptInjector.create_caption_writer_script(final_caption)
-
-                    caption_result = self.driver_manager.execute_script(js_script)
+                    caption_result = self.driver_manager.execute_script(
+                        JavaScriptInjector.CAPTION_WRITER_SCRIPT, final_caption
+                    )
                     if not caption_result:
                         # Fallback: escribir directamente
                         caption_box.clear()
@@ -461,7 +603,7 @@ class MessageSender:
                     caption_box.clear()
                     caption_box.send_keys(final_caption)
 
-                time.sleep(WhatsAppConstants.MEDIUM_DELAY)
+                # _send_media espera al botón de enviar, no hace falta una pausa fija
                 return True
             else:
                 self._update_status("⚠️ No se encontró área de caption")
@@ -480,7 +622,7 @@ class MessageSender:
         """
         try:
             send_button = self.driver_manager.wait_for_element(
-                WhatsAppConstants.SELECTORS['send_button'],
+                WhatsAppConstants.get_selectors('send_button'),
                 timeout=10,
                 clickable=True
             )
@@ -493,13 +635,48 @@ class MessageSender:
                 self._update_status("❌ No se pudo hacer click en enviar")
                 return False
 
-            time.sleep(WhatsAppConstants.LONG_DELAY)
+            # Esperar a que se cierre la vista previa (desaparece su botón de enviar),
+            # como máximo la pausa fija que se usaba antes
+            self.driver_manager.wait_until(
+                lambda driver: not send_button.is_displayed(),
+                timeout=WhatsAppConstants.LONG_DELAY
+            )
             return True
 
         except Exception as e:
             self._update_status(f"Error enviando archivo: {str(e)}")
             return False
 
+    def _resolve_valid_image(self, image_filename: str) -> Optional[str]:
+        """
+        Obtiene la ruta absoluta de una imagen válida con un solo stat en el caso normal
+
+        La validación se repite en cada envío: si el archivo se reemplaza, trunca o borra
+        durante la sesión se reporta aquí y no como un fallo tardío de la subida.
+
+        Args:
+            image_filename: Nombre del archivo de imagen
+
+        Returns:
+            Ruta absoluta de la imagen o None si no existe o no es válida
+        """
+        # La misma imagen se repite en cada ciclo de mensajes: resolver la ruta una sola vez
+        image_path = self._image_path_cache.get(image_filename)
+        if not image_path:
+            image_path = get_absolute_image_path(image_filename, must_exist=False)
+            if image_path:
+                self._image_path_cache[image_filename] = image_path
+
+        if image_path and self.file_validator.validate_image_file(image_path):
+            return image_path
+
+        # Solo en el caso de error se distingue entre archivo inexistente e inválido
+        if image_path and os.path.exists(image_path):
+            self._update_status("❌ Imagen no válida")
+        else:
+            self._update_status(f"❌ Imagen no encontrada: {image_filename}")
+        return None
+
     def send_image_only(self, image_filename: str) -> bool:
         """
         Envía solo una imagen sin texto
@@ -511,13 +688,8 @@ class MessageSender:
             True si se envió correctamente
         """
         try:
-            image_path = get_absolute_image_path(image_filename)
+            image_path = self._resolve_valid_image(image_filename)
             if not image_path:
-                self._update_status(f"❌ Imagen no encontrada: {image_filename}")
-                return False
-
-            if not self.file_validator.validate_image_file(image_path):
-                self._update_status("❌ Imagen no válida")
                 return False
 
             self._update_status(f"🖼️ Enviando imagen: {os.path.basename(image_path)}")
@@ -555,13 +727,8 @@ class MessageSender:
             True si se envió correctamente
         """
         try:
-            image_path = get_absolute_image_path(image_filename)
+            image_path = self._resolve_valid_image(image_filename)
             if not image_path:
-                self._update_status(f"❌ Imagen no encontrada: {image_filename}")
-                return False
-
-            if not self.file_validator.validate_image_file(image_path):
-                self._update_status("❌ Imagen no válida")
                 return False
 
             self._update_status(f"🖼️📝 Enviando imagen con caption: {os.path.basename(image_path)}")
@@ -601,7 +768,7 @@ class MessageSender:
             True si se envió correctamente
         """
         try:
-            if not self.driver_manager.is_session_alive():
+            if not self.driver_manager.get_driver():
                 self._update_status("❌ Sesión perdida, no se puede enviar mensaje")
                 return False
 
@@ -613,6 +780,15 @@ class MessageSender:
             image_filename = message_data.get('imagen')
             envio_conjunto = message_data.get('envio_conjunto', False)
 
+            # Personalizar una sola vez con las partes precalculadas (mark_message); sin
+            # placeholders no se re-escanea el texto. Los envíos de abajo reciben el texto final
+            if contact_data and text and self.personalizer.needs_personalization(message_data):
+                text = self.personalizer.render_template(
+                    self.personalizer.get_template_parts(message_data), contact_data
+                ).strip()
+                self._update_status(f"📝 Mensaje personalizado para {contact_data.get('nombre', 'contacto')}")
+            contact_data = None
+
             # Envío conjunto: imagen con caption
             if image_filename and text and envio_conjunto:
                 self._update_status("📤 Enviando imagen con caption (modo conjunto)...")
@@ -627,10 +803,8 @@ class MessageSender:
                     self._update_status("⚠️ Error enviando imagen, intentando solo con texto...")
                     return self.send_text_message(text, contact_data)
 
-                # 2. Esperar brevemente
-                time.sleep(WhatsAppConstants.MEDIUM_DELAY)
-
-                # 3. Enviar texto (NUEVO: con personalización)
+                # 2. Enviar texto (NUEVO: con personalización); la espera del campo de
+                # mensaje en send_text_message sustituye a la pausa fija entre ambos envíos
                 if not self.send_text_message(text, contact_data):
                     self._update_status("⚠️ Imagen enviada pero falló el texto")
                     return True  # Al menos la imagen se envió
@@ -656,9 +830,10 @@ class MessageSender:
 
     def clear_cache(self):
         """
-        Limpia el cache del validador de archivos
+        Limpia el cache del validador de archivos y de rutas de imágenes
         """
         self.file_validator.clear_cache()
+        self._image_path_cache.clear()
 
     def get_personalizer(self) -> MessagePersonalizer:
         """
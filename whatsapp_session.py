@@ -8,7 +8,7 @@ verificación de estado de la interfaz y manejo de reconexiones automáticas.
 
 import time
 from typing import Optional, Callable
-from whatsapp_utils import WhatsAppConstants
+from whatsapp_utils import WhatsAppConstants, JavaScriptInjector
 from whatsapp_driver import ChromeDriverManager
 
 
@@ -37,9 +37,11 @@ class WhatsAppSession:
         Args:
             message: Mensaje de estado
         """
-        print(f"[Session] {message}")
+        # Con callback la GUI ya muestra el mensaje; stdout solo se usa sin GUI
         if self.status_callback:
             self.status_callback(message)
+        else:
+            print(f"[Session] {message}")
 
     def open_whatsapp_web(self) -> bool:
         """
@@ -74,23 +76,22 @@ class WhatsAppSession:
         Returns:
             True si se logró establecer la sesión
         """
-        # Intentar detectar si ya está logueado
-        if self._detect_main_interface():
+        # Una sola espera en el navegador: lo que aparezca primero (interfaz principal o QR)
+        page_state = self._detect_page_state(WhatsAppConstants.DEFAULT_WAIT_TIMEOUT)
+
+        if page_state == 'main' or (page_state is None and self._detect_main_interface()):
             self._update_status("WhatsApp Web ya está logueado")
             self._is_logged_in = True
             self._session_validated = True
             return True
 
         # Si no está logueado, buscar QR code
-        if self._detect_qr_code():
+        if page_state == 'qr' or self._detect_qr_code():
             return self._handle_qr_login()
 
-        # Intentar esperar un poco más por si está cargando
+        # Esperar un poco más por si está cargando: responde en cuanto aparece la interfaz
         self._update_status("Esperando carga completa de WhatsApp Web...")
-        time.sleep(3)
-
-        # Intentar nuevamente
-        if self._detect_main_interface():
+        if self._detect_main_interface(timeout=WhatsAppConstants.ELEMENT_WAIT_TIMEOUT):
             self._is_logged_in = True
             self._session_validated = True
             return True
@@ -98,18 +99,38 @@ class WhatsAppSession:
         self._update_status("No se pudo determinar el estado de WhatsApp Web")
         return False
 
-    def _detect_main_interface(self) -> bool:
+    def _detect_page_state(self, timeout: float) -> Optional[str]:
+        """
+        Espera a que aparezca la interfaz principal o el código QR, lo que ocurra primero
+
+        Args:
+            timeout: Tiempo máximo de espera en segundos
+
+        Returns:
+            'main', 'qr' o None si no apareció ninguno
+        """
+        return self.driver_manager.execute_async_script(
+            JavaScriptInjector.PAGE_STATE_SCRIPT,
+            WhatsAppConstants.get_selectors('search_box'),
+            WhatsAppConstants.get_selectors('qr_code'),
+            int(timeout * 1000)
+        )
+
+    def _detect_main_interface(self, timeout: int = 5) -> bool:
         """
         Detecta si la interfaz principal de WhatsApp Web está cargada
 
+        Args:
+            timeout: Tiempo máximo de espera por la caja de búsqueda
+
         Returns:
             True si la interfaz principal está presente
         """
         try:
             # Buscar elementos de la interfaz principal
             main_element = self.driver_manager.wait_for_element(
-                WhatsAppConstants.SELECTORS['search_box'],
-                timeout=5
+                WhatsAppConstants.get_selectors('search_box'),
+                timeout=timeout
             )
 
             if main_element:
@@ -117,8 +138,8 @@ class WhatsAppSession:
 
             # Buscar elementos alternativos de la interfaz principal
             alternative_selectors = [
-                "//div[@title='Nueva conversación']",
-                "//div[@contenteditable='true'][@data-tab='3']",
+                "div[title='Nueva conversación']",
+                "div[contenteditable='true'][data-tab='3']",
                 "div[data-testid='chatlist']",
                 "div[aria-label='Lista de conversaciones']"
             ]
@@ -144,7 +165,7 @@ class WhatsAppSession:
             qr_selectors = [
                 "canvas[aria-label='Scan me!']",
                 "canvas",
-                "//div[@data-ref]//canvas",
+                "div[data-ref] canvas",
                 "div[data-testid='qrcode']"
             ]
 
@@ -164,13 +185,19 @@ class WhatsAppSession:
         try:
             self._update_status("Código QR detectado. Escanea el código QR en WhatsApp Web para continuar")
 
-            # Esperar hasta 60 segundos por el login
+            # Esperar hasta 60 segundos por el login. Las detecciones ya esperan a que aparezcan
+            # los elementos, así que no hace falta dormir entre comprobaciones
             max_wait_time = 60
-            check_interval = 2
-            checks_performed = 0
-            max_checks = max_wait_time // check_interval
+            progress_interval = 10
+            start_time = time.monotonic()
+            deadline = start_time + max_wait_time
+            next_progress = start_time + progress_interval
+
+            while time.monotonic() < deadline:
+                if not self.driver_manager.is_session_alive():
+                    self._update_status("El navegador se cerró durante el login con QR")
+                    return False
 
-            while checks_performed < max_checks:
                 # Verificar si ya se logueó
                 if self._detect_main_interface():
                     self._update_status("QR escaneado correctamente, WhatsApp Web listo")
@@ -182,20 +209,18 @@ class WhatsAppSession:
                 if not self._detect_qr_code():
                     # El QR desapareció, podría estar cargando
                     self._update_status("QR procesado, verificando login...")
-                    time.sleep(3)
 
-                    if self._detect_main_interface():
+                    if self._detect_main_interface(timeout=WhatsAppConstants.ELEMENT_WAIT_TIMEOUT):
                         self._is_logged_in = True
                         self._session_validated = True
                         return True
 
-                time.sleep(check_interval)
-                checks_performed += 1
-
                 # Mostrar progreso cada 10 segundos
-                if checks_performed % 5 == 0:
-                    remaining_time = max_wait_time - (checks_performed * check_interval)
+                now = time.monotonic()
+                if now >= next_progress:
+                    remaining_time = max(0, int(deadline - now))
                     self._update_status(f"Esperando escaneo del QR... ({remaining_time}s restantes)")
+                    next_progress = now + progress_interval
 
             self._update_status("Tiempo de espera del QR agotado")
             return False
@@ -292,10 +317,7 @@ class WhatsAppSession:
             if not self.driver_manager.navigate_to(WhatsAppConstants.WHATSAPP_WEB_URL):
                 return False
 
-            # Esperar un momento para la carga
-            time.sleep(WhatsAppConstants.MEDIUM_DELAY)
-
-            # Validar nueva sesión
+            # Validar nueva sesión (la detección espera a que la interfaz termine de cargar)
             return self.validate_session()
 
         except Exception as e:
@@ -12,6 +12,16 @@ import os
 import json
 from typing import Dict, Any, Optional, List
 
+# Detección de emoticones sin regex. La unión de rangos del patrón original
+# (emoticones, pictogramas, banderas, símbolos varios, U+24C2-U+1F251 y todo el
+# rango no-BMP) equivale a: cualquier code point >= U+24C2, más cuatro caracteres
+# sueltos (ZWJ, reloj, expulsar y avance rápido)
+_EMOJI_MIN_CODEPOINT = 0x24C2
+_EMOJI_SINGLE_CHARS = frozenset('\u200d\u231a\u23cf\u23e9')
+
+# Caracteres fuera del Basic Multilingual Plane (no soportados por send_keys)
+_NON_BMP_RE = re.compile('[\U00010000-\U0010FFFF]')
+
 
 class SelectorsConfig:
     """
@@ -135,6 +145,13 @@ class WhatsAppConstants:
     DEFAULT_WAIT_TIMEOUT = 15
     ELEMENT_WAIT_TIMEOUT = 10
     PAGE_LOAD_TIMEOUT = 30
+    SCRIPT_TIMEOUT = 30
+    SESSION_CHECK_MAX_AGE = 15
+    SEARCH_RESULTS_TIMEOUT = 3
+    ELEMENT_POLL_FREQUENCY = 0.25
+
+    # Reintentos
+    NAVIGATION_ATTEMPTS = 3
 
     # Intervalos de tiempo (en segundos)
     SHORT_DELAY = 0.3
@@ -145,13 +162,22 @@ class WhatsAppConstants:
     MAX_FILE_SIZE_MB = 64
     MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
 
+    # Límites de cache
+    CONTACT_STRATEGY_CACHE_SIZE = 128
+
     # Extensiones de imagen válidas
-    VALID_IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
+    VALID_IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'})
 
     # URLs de WhatsApp
     WHATSAPP_WEB_URL = "https://web.whatsapp.com"
     WHATSAPP_SEND_URL = "https://web.whatsapp.com/send?phone={}"
 
+    # Recursos que el bot no necesita y se bloquean en el navegador. Solo fotos de perfil:
+    # los medios (mmg/media-*.whatsapp.net) también se usan para subir imágenes
+    BLOCKED_URL_PATTERNS = (
+        "*pps.whatsapp.net*",
+    )
+
     # Selectores por defecto (pueden ser sobrescritos por configuración)
     DEFAULT_SELECTORS = {
         'search_box': [
@@ -182,6 +208,11 @@ class WhatsAppConstants:
             "input[type='file'][accept*='image']",
             "input[type='file']",
             "li[data-testid='mi-attach-image'] input"
+        ],
+        'qr_code': [
+            "canvas[aria-label='Scan me!']",
+            "div[data-testid='qrcode'] canvas",
+            "div[data-ref] canvas"
         ]
     }
 
@@ -305,49 +336,15 @@ class UnicodeHandler:
             True si contiene emoticones o caracteres especiales
         """
         try:
-            # Patrón optimizado para detectar emoticones
-            emoji_pattern = re.compile(
-                "["
-                "\U0001F600-\U0001F64F"  # emoticones faciales
-                "\U0001F300-\U0001F5FF"  # símbolos & pictogramas
-                "\U0001F680-\U0001F6FF"  # transporte & símbolos de mapa
-                "\U0001F1E0-\U0001F1FF"  # banderas (iOS)
-                "\U00002500-\U00002BEF"  # símbolos varios
-                "\U00002702-\U000027B0"
-                "\U000024C2-\U0001F251"
-                "\U0001f926-\U0001f937"
-                "\U00010000-\U0010ffff"
-                "\u2640-\u2642"
-                "\u2600-\u2B55"
-                "\u200d"
-                "\u23cf"
-                "\u23e9"
-                "\u231a"
-                "\ufe0f"  # variaciones de emoji
-                "\u3030"
-                "]+", flags=re.UNICODE)
-
-            return bool(emoji_pattern.search(text))
+            # Camino rápido: el texto ASCII puro nunca contiene emoticones
+            if text.isascii():
+                return False
+            if max(map(ord, text)) >= _EMOJI_MIN_CODEPOINT:
+                return True
+            return not _EMOJI_SINGLE_CHARS.isdisjoint(text)
         except Exception:
             return True  # En caso de duda, asumir que tiene Unicode
 
-    @staticmethod
-    def escape_unicode_for_js(text: str) -> str:
-        """
-        Escapa caracteres Unicode para uso seguro en JavaScript
-
-        Args:
-            text: Texto a escapar
-
-        Returns:
-            Texto escapado para JavaScript
-        """
-        try:
-            escaped = json.dumps(text, ensure_ascii=False)[1:-1]
-            return escaped
-        except Exception:
-            return text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
-
     @staticmethod
     def filter_bmp_characters(text: str) -> str:
         """
@@ -360,8 +357,9 @@ class UnicodeHandler:
             Texto filtrado solo con caracteres BMP
         """
         try:
-            filtered = ''.join(char for char in text if ord(char) <= 0xFFFF)
-            return filtered
+            if text.isascii():
+                return text
+            return _NON_BMP_RE.sub('', text)
         except Exception:
             return text
 
@@ -372,6 +370,7 @@ class FileValidator:
     """
 
     def __init__(self):
+        # ruta -> ((mtime, tamaño), es_válida)
         self._validation_cache = {}
 
     def validate_image_file(self, image_path: str) -> bool:
@@ -384,33 +383,25 @@ class FileValidator:
         Returns:
             True si la imagen es válida
         """
-        # Cache de validaciones para evitar re-validar
-        if image_path in self._validation_cache:
-            return self._validation_cache[image_path]
-
         try:
-            if not os.path.exists(image_path):
-                self._validation_cache[image_path] = False
-                return False
+            # Un solo stat por validación; el cache se invalida si el archivo cambia
+            stat_result = os.stat(image_path)
+        except OSError:
+            self._validation_cache.pop(image_path, None)
+            return False
 
-            # Verificar tamaño del archivo
-            file_size = os.path.getsize(image_path)
-            if file_size > WhatsAppConstants.MAX_FILE_SIZE_BYTES:
-                self._validation_cache[image_path] = False
-                return False
+        cache_key = (stat_result.st_mtime, stat_result.st_size)
+        cached = self._validation_cache.get(image_path)
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
 
-            # Verificar extensión
-            ext = os.path.splitext(image_path)[1].lower()
-            if ext not in WhatsAppConstants.VALID_IMAGE_EXTENSIONS:
-                self._validation_cache[image_path] = False
-                return False
-
-            self._validation_cache[image_path] = True
-            return True
+        # Verificar tamaño y extensión del archivo
+        ext = os.path.splitext(image_path)[1].lower()
+        is_valid = (stat_result.st_size <= WhatsAppConstants.MAX_FILE_SIZE_BYTES
+                    and ext in WhatsAppConstants.VALID_IMAGE_EXTENSIONS)
 
-        except Exception:
-            self._validation_cache[image_path] = False
-            return False
+        self._validation_cache[image_path] = (cache_key, is_valid)
+        return is_valid
 
     def clear_cache(self):
         """
@@ -421,173 +412,347 @@ class FileValidator:
 
 class JavaScriptInjector:
     """
-    Generador de scripts JavaScript para el bot con selectores dinámicos
-    """
-
-    @staticmethod
-    def create_message_sender_script(message_text: str) -> str:
-        """
-        Crea script JavaScript mejorado para enviar mensajes con selectores dinámicos
-
-        Args:
-            message_text: Texto del mensaje a enviar
-
-        Returns:
-            Script JavaScript listo para ejecutar
-        """
-        escaped_text = UnicodeHandler.escape_unicode_for_js(message_text)
-
-        # Obtener selectores dinámicos para message_box
-        message_selectors = WhatsAppConstants.get_selectors('message_box')
-
-        # Convertir selectores a JavaScript
-        js_selectors = ', '.join([f"'{sel}'" for sel in message_selectors])
-
-        return f"""
-        function sendMessageOptimized() {{
-            try {{
-                // PASO 1: Buscar el campo de mensaje con selectores configurables
-                const selectors = [{js_selectors}];
-                let messageBox = null;
+    Scripts JavaScript del bot con selectores dinámicos
 
-                for (const selector of selectors) {{
-                    messageBox = document.querySelector(selector);
-                    if (messageBox) break;
-                }}
+    Los scripts son constantes: el texto y los selectores se pasan como argumentos
+    de execute_script/execute_async_script (arguments[N]), así el navegador no recibe
+    un script distinto en cada envío y no hace falta escapar el texto a mano.
+    """
 
-                if (!messageBox) {{
-                    console.log("MessageBox no encontrado con selectores configurados");
-                    return false;
-                }}
+    # Script asíncrono (execute_async_script): arguments[0]: texto, arguments[1]: selectores
+    # message_box, arguments[2]: selectores send_button, último argumento: callback de Selenium
+    MESSAGE_SENDER_SCRIPT = """
+        const done = arguments[arguments.length - 1];
+        const textToSend = arguments[0];
+        const selectors = arguments[1];
+        const sendSelectors = arguments[2];
+
+        // Sondeo corto en lugar de esperas fijas: se responde en cuanto WhatsApp reacciona
+        const POLL_MS = 25;
+        const SEND_BUTTON_TIMEOUT_MS = 5000;
+        const CLEAR_TIMEOUT_MS = 3000;
+
+        try {
+            // PASO 1: Buscar el campo de mensaje con selectores configurables
+            let messageBox = null;
+
+            for (const selector of selectors) {
+                messageBox = document.querySelector(selector);
+                if (messageBox) break;
+            }
+
+            if (!messageBox) {
+                console.log("MessageBox no encontrado con selectores configurados");
+                done(false);
+                return;
+            }
+
+            // PASO 2: Limpiar y preparar el campo
+            messageBox.focus();
+            messageBox.innerHTML = '';
+
+            // PASO 3: Insertar el texto con método mejorado
+            // Usar execCommand como método primario para emoticones
+            document.execCommand('insertText', false, textToSend);
+
+            // Los saltos de línea se convierten en párrafos: comparar sin espacios
+            const normalize = (value) => (value || '').replace(/\s+/g, '');
+            const wasInserted = () => normalize(messageBox.textContent) === normalize(textToSend);
+
+            // Fallback 1: pegado sintético (un solo evento, sin permisos de portapapeles)
+            if (!wasInserted()) {
+                document.execCommand('selectAll', false, null);
+                const clipboardData = new DataTransfer();
+                clipboardData.setData('text/plain', textToSend);
+                messageBox.dispatchEvent(new ClipboardEvent('paste', {
+                    clipboardData: clipboardData,
+                    bubbles: true,
+                    cancelable: true
+                }));
+            }
 
-                // PASO 2: Limpiar y preparar el campo
-                messageBox.focus();
+            // Fallback 2: método de nodo de texto
+            if (!wasInserted()) {
                 messageBox.innerHTML = '';
+                const textNode = document.createTextNode(textToSend);
+                messageBox.appendChild(textNode);
+            }
 
-                // PASO 3: Insertar el texto con método mejorado
-                const textToSend = "{escaped_text}";
-
-                // Usar execCommand como método primario para emoticones
-                document.execCommand('insertText', false, textToSend);
-
-                // Fallback: método de nodo de texto
-                if (messageBox.textContent !== textToSend) {{
-                    messageBox.innerHTML = '';
-                    const textNode = document.createTextNode(textToSend);
-                    messageBox.appendChild(textNode);
-                }}
-
-                // PASO 4: Disparar eventos necesarios
-                const events = ['input', 'change', 'keyup'];
-                events.forEach(eventType => {{
-                    const event = new Event(eventType, {{
-                        bubbles: true,
-                        cancelable: true
-                    }});
-                    messageBox.dispatchEvent(event);
-                }});
-
-                // PASO 5: Esperar breve momento para que aparezca el botón de envío
-                return new Promise(resolve => {{
-                    setTimeout(() => {{
-                        // Buscar botón de envío con selectores dinámicos
-                        const sendSelectors = {JavaScriptInjector._get_send_button_selectors_js()};
-                        let sendButton = null;
-
-                        for (const selector of sendSelectors) {{
-                            sendButton = document.querySelector(selector);
-                            if (sendButton && !sendButton.disabled) break;
-                        }}
-
-                        if (sendButton && !sendButton.disabled) {{
-                            console.log("Enviando mensaje con botón encontrado");
-                            sendButton.click();
-
-                            // PASO 6: Verificar que el mensaje se envió
-                            setTimeout(() => {{
-                                const currentText = messageBox.textContent || messageBox.innerText || '';
-                                const wasCleared = currentText.trim() === '' || currentText !== textToSend;
-                                console.log("Mensaje enviado:", wasCleared);
-                                resolve(wasCleared);
-                            }}, 500);
-                        }} else {{
-                            console.log("Botón de envío no encontrado o deshabilitado");
-                            resolve(false);
-                        }}
-                    }}, 300);
-                }});
-
-            }} catch (error) {{
-                console.log("Error en sendMessageOptimized:", error);
-                return false;
-            }}
-        }}
-
-        // Ejecutar la función y retornar el resultado
-        return sendMessageOptimized();
-        """
-
-    @staticmethod
-    def _get_send_button_selectors_js() -> str:
-        """
-        Obtiene selectores del botón send en formato JavaScript
-        """
-        send_selectors = WhatsAppConstants.get_selectors('send_button')
-        return '[' + ', '.join([f"'{sel}'" for sel in send_selectors]) + ']'
-
-    @staticmethod
-    def create_caption_writer_script(caption_text: str) -> str:
+            // PASO 4: Disparar eventos necesarios
+            const events = ['input', 'change', 'keyup'];
+            events.forEach(eventType => {
+                const event = new Event(eventType, {
+                    bubbles: true,
+                    cancelable: true
+                });
+                messageBox.dispatchEvent(event);
+            });
+
+            const findSendButton = () => {
+                for (const selector of sendSelectors) {
+                    const button = document.querySelector(selector);
+                    if (button && !button.disabled) return button;
+                }
+                return null;
+            };
+
+            // PASO 6: Verificar que el mensaje se envió (campo vacío o distinto)
+            const waitForCleared = (clickedAt) => {
+                const currentText = messageBox.textContent || messageBox.innerText || '';
+                if (currentText.trim() === '' || currentText !== textToSend) {
+                    console.log("Mensaje enviado:", true);
+                    done(true);
+                } else if (Date.now() - clickedAt > CLEAR_TIMEOUT_MS) {
+                    console.log("Mensaje enviado:", false);
+                    done(false);
+                } else {
+                    setTimeout(() => waitForCleared(clickedAt), POLL_MS);
+                }
+            };
+
+            // PASO 5: Hacer click en cuanto aparezca el botón de envío
+            const startedAt = Date.now();
+            const waitForSendButton = () => {
+                const sendButton = findSendButton();
+                if (sendButton) {
+                    console.log("Enviando mensaje con botón encontrado");
+                    sendButton.click();
+                    waitForCleared(Date.now());
+                } else if (Date.now() - startedAt > SEND_BUTTON_TIMEOUT_MS) {
+                    console.log("Botón de envío no encontrado o deshabilitado");
+                    done(false);
+                } else {
+                    setTimeout(waitForSendButton, POLL_MS);
+                }
+            };
+            waitForSendButton();
+
+        } catch (error) {
+            console.log("Error en sendMessageOptimized:", error);
+            done(false);
+        }
         """
-        Crea script JavaScript para escribir captions con emoticones
-
-        Args:
-            caption_text: Texto del caption
 
-        Returns:
-            Script JavaScript para escribir caption
-        """
-        escaped_caption = UnicodeHandler.escape_unicode_for_js(caption_text)
-
-        return f"""
-        try {{
-            const captionBox = document.evaluate(
-                "//*[@id='app']/div/div[3]/div/div[2]/div[2]/span/div/div/div/div[2]/div/div[1]/div[3]/div/div/div[2]/div[1]/div[1]/p",
-                document,
-                null,
-                XPathResult.FIRST_ORDERED_NODE_TYPE,
-                null
-            ).singleNodeValue ||
-            document.evaluate(
-                "//*[@id='app']/div/div[3]/div/div[2]/div[2]/span/div/div/div/div[2]/div/div[1]/div[3]/div/div/div[2]",
-                document,
-                null,
-                XPathResult.FIRST_ORDERED_NODE_TYPE,
-                null
-            ).singleNodeValue ||
+    # arguments[0]: texto del caption
+    CAPTION_WRITER_SCRIPT = """
+        try {
+            const captionBox = document.querySelector("#app > div > div:nth-of-type(3) > div > div:nth-of-type(2) > div:nth-of-type(2) > span > div > div > div > div:nth-of-type(2) > div > div:nth-of-type(1) > div:nth-of-type(3) > div > div > div:nth-of-type(2) > div:nth-of-type(1) > div:nth-of-type(1) > p") ||
+            document.querySelector("#app > div > div:nth-of-type(3) > div > div:nth-of-type(2) > div:nth-of-type(2) > span > div > div > div > div:nth-of-type(2) > div > div:nth-of-type(1) > div:nth-of-type(3) > div > div > div:nth-of-type(2)") ||
             document.querySelector('[contenteditable="true"][data-tab="10"]');
 
-            if (captionBox) {{
+            if (captionBox) {
                 captionBox.focus();
                 captionBox.innerHTML = '';
 
-                const textToSend = "{escaped_caption}";
+                const textToSend = arguments[0];
                 const textNode = document.createTextNode(textToSend);
                 captionBox.appendChild(textNode);
 
-                const inputEvent = new InputEvent('input', {{
+                const inputEvent = new InputEvent('input', {
                     bubbles: true,
                     cancelable: true,
                     data: textToSend
-                }});
+                });
                 captionBox.dispatchEvent(inputEvent);
                 return true;
-            }}
+            }
             return false;
-        }} catch (error) {{
+        } catch (error) {
             console.log("Error caption:", error);
             return false;
-        }}
+        }
+        """
+
+    # Script asíncrono: arguments[0]: selectores CSS por prioridad, arguments[1]: timeout (ms),
+    # arguments[2]: exigir visible/habilitado. Responde con el elemento o null en cuanto el DOM
+    # cambia, sin sondeos desde Python
+    WAIT_FOR_ELEMENT_SCRIPT = """
+        const done = arguments[arguments.length - 1];
+        const selectors = arguments[0];
+        const timeoutMs = arguments[1];
+        const clickable = arguments[2];
+
+        const isUsable = (element) => {
+            if (!clickable) return true;
+            if (element.disabled) return false;
+            if (element.getClientRects().length === 0) return false;
+            return getComputedStyle(element).visibility !== 'hidden';
+        };
+
+        const findFirst = () => {
+            for (const selector of selectors) {
+                let elements;
+                try {
+                    elements = document.querySelectorAll(selector);
+                } catch (error) {
+                    continue;  // Selector inválido: probar el siguiente
+                }
+                for (const element of elements) {
+                    if (isUsable(element)) return element;
+                }
+            }
+            return null;
+        };
+
+        let finished = false;
+        let observer = null;
+        let timer = null;
+        const finish = (result) => {
+            if (finished) return;
+            finished = true;
+            if (observer) observer.disconnect();
+            if (timer) clearTimeout(timer);
+            done(result);
+        };
+
+        const initial = findFirst();
+        if (initial) {
+            finish(initial);
+            return;
+        }
+
+        observer = new MutationObserver(() => {
+            const element = findFirst();
+            if (element) finish(element);
+        });
+        observer.observe(document, {
+            subtree: true,
+            childList: true,
+            attributes: clickable
+        });
+        timer = setTimeout(() => finish(findFirst()), timeoutMs);
+        """
+
+    # Script asíncrono: arguments[0]: selectores de la interfaz principal, arguments[1]: selectores
+    # del código QR, arguments[2]: timeout (ms). Responde 'main', 'qr' o null con lo que aparezca antes
+    PAGE_STATE_SCRIPT = """
+        const done = arguments[arguments.length - 1];
+        const mainSelectors = arguments[0];
+        const qrSelectors = arguments[1];
+        const timeoutMs = arguments[2];
+
+        // Los selectores configurables pueden ser XPath ('/' o '(' al inicio) o CSS
+        const matches = (selectors) => selectors.some((selector) => {
+            try {
+                if (selector.startsWith('/') || selector.startsWith('(')) {
+                    return document.evaluate(
+                        selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+                    ).singleNodeValue !== null;
+                }
+                return document.querySelector(selector) !== null;
+            } catch (error) {
+                return false;
+            }
+        });
+        const detect = () => {
+            if (matches(mainSelectors)) return 'main';
+            if (matches(qrSelectors)) return 'qr';
+            return null;
+        };
+
+        let finished = false;
+        let observer = null;
+        let timer = null;
+        const finish = (result) => {
+            if (finished) return;
+            finished = true;
+            if (observer) observer.disconnect();
+            if (timer) clearTimeout(timer);
+            done(result);
+        };
+
+        const initial = detect();
+        if (initial) {
+            finish(initial);
+            return;
+        }
+
+        observer = new MutationObserver(() => {
+            const state = detect();
+            if (state) finish(state);
+        });
+        observer.observe(document, {subtree: true, childList: true});
+        timer = setTimeout(() => finish(detect()), timeoutMs);
+        """
+
+    # arguments[0]: selectores CSS de resultados de búsqueda. Marca los resultados que ya están en
+    # pantalla (de una búsqueda anterior) para que SEARCH_RESULTS_READY_SCRIPT no los cuente
+    MARK_SEARCH_RESULTS_SCRIPT = """
+        let marked = 0;
+        for (const selector of arguments[0]) {
+            for (const element of document.querySelectorAll(selector)) {
+                element.dataset.waBotPrevious = '1';
+                marked++;
+            }
+        }
+        return marked;
+        """
+
+    # arguments[0]: selectores CSS de resultados, arguments[1]: dígitos del número buscado.
+    # true si hay un resultado que contiene el número o, en su defecto, uno nuevo (no marcado)
+    # cuando los resultados anteriores ya desaparecieron
+    SEARCH_RESULTS_READY_SCRIPT = """
+        const selectors = arguments[0];
+        const digits = arguments[1];
+        const tail = digits.slice(-8);
+
+        let previousVisible = false;
+        let newResult = false;
+        for (const selector of selectors) {
+            for (const element of document.querySelectorAll(selector)) {
+                const text = (element.textContent || '').replace(/\\D/g, '');
+                if (tail && text.includes(tail)) return true;
+                if (element.dataset.waBotPrevious) {
+                    previousVisible = true;
+                } else {
+                    newResult = true;
+                }
+            }
+        }
+        return newResult && !previousVisible;
+        """
+
+    # arguments[0]: lista de selectores CSS/XPath ('/' o '(' al inicio). Devuelve el primer
+    # elemento encontrado o null, en una sola consulta sin pasar por la espera implícita
+    FIRST_MATCH_SCRIPT = """
+        for (const selector of arguments[0]) {
+            try {
+                const element = (selector.startsWith('/') || selector.startsWith('('))
+                    ? document.evaluate(
+                        selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+                    ).singleNodeValue
+                    : document.querySelector(selector);
+                if (element) return element;
+            } catch (error) {
+                // Selector inválido: probar el siguiente
+            }
+        }
+        return null;
+        """
+
+    # Igual que FIRST_MATCH_SCRIPT pero devuelve el textContent del elemento (o null): una sola
+    # llamada, sin referencias a elementos que puedan quedar obsoletas entre sondeos
+    FIRST_MATCH_TEXT_SCRIPT = (
+        "const element = (function () {" + FIRST_MATCH_SCRIPT + "}).apply(null, arguments);"
+        "return element ? element.textContent : null;"
+    )
+
+    @staticmethod
+    def get_message_sender_args(message_text: str) -> list:
+        """
+        Obtiene los argumentos para MESSAGE_SENDER_SCRIPT con selectores dinámicos
+
+        Args:
+            message_text: Texto del mensaje a enviar
+
+        Returns:
+            Lista [texto, selectores message_box, selectores send_button]
         """
+        return [
+            message_text,
+            WhatsAppConstants.get_selectors('message_box'),
+            WhatsAppConstants.get_selectors('send_button')
+        ]
 
 
 def get_image_folder_path() -> str:
@@ -600,12 +765,13 @@ def get_image_folder_path() -> str:
     return "imagenes_mensajes"
 
 
-def get_absolute_image_path(image_filename: str) -> Optional[str]:
+def get_absolute_image_path(image_filename: str, must_exist: bool = True) -> Optional[str]:
     """
     Obtiene la ruta absoluta de una imagen
 
     Args:
         image_filename: Nombre del archivo de imagen
+        must_exist: Si False no se comprueba la existencia (la hará el validador con os.stat)
 
     Returns:
         Ruta absoluta o None si no existe
@@ -614,4 +780,6 @@ def get_absolute_image_path(image_filename: str) -> Optional[str]:
         return None
 
     image_path = os.path.join(get_image_folder_path(), image_filename)
-    return os.path.abspath(image_path) if os.path.exists(image_path) else None
\ No newline at end of file
+    if must_exist and not os.path.exists(image_path):
+        return None
+    return os.path.abspath(image_path)
\ No newline at end of file